@@ -15,8 +15,10 @@ from .base import (
     CVESeverity,
     VendorRiskTier,
     AegisModel,
+    FrozenAegisModel,
     ClassificationMarking,
     EventEnvelope,
+    compute_hash_chain,
 )
 
 __all__ = [
@@ -31,6 +33,8 @@ __all__ = [
     "CVESeverity",
     "VendorRiskTier",
     "AegisModel",
+    "FrozenAegisModel",
     "ClassificationMarking",
     "EventEnvelope",
+    "compute_hash_chain",
 ]
@@ -18,10 +18,19 @@ Redaction is applied *after allow* using policy redaction rules.
 from __future__ import annotations
 
 from enum import Enum
-from typing import Optional, List, Dict, Any
+from functools import partial
+from typing import Optional, List, Dict, Any, Callable, Iterable, Mapping, Tuple, Collection
 from uuid import UUID
 
-from .base import ClassificationLevel, Compartment
+from .base import (
+    ClassificationLevel,
+    Compartment,
+    _CLASSIFICATION_RANK,
+    _COMPARTMENT_BIT,
+    _PORTION_MARKING,
+    compartment_mask,
+    compartments_from_mask,
+)
 from .policy_obligations import (
     ClassificationPolicy,
     AccessDecision,
@@ -31,6 +40,55 @@ from .policy_obligations import (
 )
 
 
+_CUI_RANK = _CLASSIFICATION_RANK[ClassificationLevel.CUI]
+_SECRET_RANK = _CLASSIFICATION_RANK[ClassificationLevel.SECRET]
+
+# (bit, value) pairs in the order denial messages list missing compartments.
+_MISSING_COMPARTMENT_ORDER = [(_COMPARTMENT_BIT[c], c.value) for c in sorted(Compartment, key=lambda c: c.value)]
+
+
+# Allow-path obligations depend only on (resource classification, device
+# untrusted, MFA verified): 24 combinations, filled lazily and shared across
+# decisions (obligations are frozen).
+_OBLIGATIONS_TABLE: Dict[Tuple[ClassificationLevel, bool, bool], Tuple[AccessDecisionObligation, ...]] = {}
+
+
+def _compute_obligations(
+    resource_classification: ClassificationLevel, device_untrusted: bool, mfa_verified: bool
+) -> Tuple[AccessDecisionObligation, ...]:
+    resource_rank = _CLASSIFICATION_RANK[resource_classification]
+    obligations: List[AccessDecisionObligation] = []
+
+    # Device posture → step-up on Secret+
+    if device_untrusted and resource_rank >= _SECRET_RANK:
+        obligations.append(
+            AccessDecisionObligation.model_construct(
+                obligation_type=ObligationType.REQUIRE_MFA_STEP_UP,
+                reason="Device is untrusted; Secret+ data requires additional MFA",
+            )
+        )
+
+    # MFA required on Secret+
+    if resource_rank >= _SECRET_RANK and not mfa_verified:
+        obligations.append(
+            AccessDecisionObligation.model_construct(
+                obligation_type=ObligationType.REQUIRE_MFA_STEP_UP,
+                reason="Secret+ data requires MFA verification",
+            )
+        )
+
+    # Audit on CUI+
+    if resource_rank >= _CUI_RANK:
+        obligations.append(
+            AccessDecisionObligation.model_construct(
+                obligation_type=ObligationType.AUDIT_ACCESS,
+                reason=f"Accessing {resource_classification.value} data",
+            )
+        )
+
+    return tuple(obligations)
+
+
 class AccessDenialReason(str, Enum):
     INSUFFICIENT_CLEARANCE = "insufficient_clearance"
     MISSING_COMPARTMENTS = "missing_compartments"
@@ -42,19 +100,38 @@ class AccessDenialReason(str, Enum):
     UNKNOWN = "unknown"
 
 
+class _ResourceProfile:
+    """Resource-side inputs of a decision, computed once per resource."""
+
+    __slots__ = ("classification", "compartments", "rank", "mask", "portion_markings")
+
+    def __init__(self, classification: ClassificationLevel, compartments: Iterable[Compartment]):
+        self.classification = classification
+        self.compartments = list(compartments)
+        self.rank = _CLASSIFICATION_RANK[classification]
+        self.mask = compartment_mask(self.compartments)
+        self.portion_markings = [_PORTION_MARKING[c] for c in self.compartments]
+
+
 class AccessControlEngine:
     def __init__(self, policy: ClassificationPolicy, signing_key: Optional[str] = None):
         self.policy = policy
         self.signing_key = signing_key
         self.redaction_engine = RedactionEngine(policy)
+        self._specialized: Dict[Tuple[ClassificationLevel, Tuple[Compartment, ...]], Callable[..., AccessDecision]] = {}
+
+    def invalidate_cache(self) -> None:
+        """Drop compiled redaction plans and specialized deciders; call after mutating the policy in place."""
+        self.redaction_engine.invalidate_cache()
+        self._specialized.clear()
 
     def make_access_decision(
         self,
         *,
         user_id: UUID,
         user_clearance: ClassificationLevel,
-        user_compartments: List[Compartment],
-        user_roles: List[str],
+        user_compartments: Collection[Compartment],
+        user_roles: Collection[str],
         user_mfa_verified: bool,
         user_account_suspended: bool,
         resource_classification: ClassificationLevel,
@@ -63,6 +140,75 @@ class AccessControlEngine:
         device_posture: str = "unknown",
         session_active: bool = True,
     ) -> AccessDecision:
+        return self._decide(
+            _ResourceProfile(resource_classification, resource_compartments),
+            user_id=user_id,
+            user_clearance=user_clearance,
+            user_compartments=user_compartments,
+            user_roles=user_roles,
+            user_mfa_verified=user_mfa_verified,
+            user_account_suspended=user_account_suspended,
+            resource_need_to_know_attrs=resource_need_to_know_attrs,
+            device_posture=device_posture,
+            session_active=session_active,
+        )
+
+    def make_access_decisions_batch(self, requests: Iterable[Mapping[str, Any]]) -> List[AccessDecision]:
+        """Decide many requests at once; each request holds make_access_decision() kwargs.
+
+        Resource profiles are shared between requests for the same resource
+        classification and compartments.
+        """
+        profiles: Dict[Tuple[ClassificationLevel, Tuple[Compartment, ...]], _ResourceProfile] = {}
+        decisions: List[AccessDecision] = []
+        for request in requests:
+            user_args = dict(request)
+            classification = user_args.pop("resource_classification")
+            compartments = tuple(user_args.pop("resource_compartments"))
+            profile = profiles.get((classification, compartments))
+            if profile is None:
+                profile = profiles[(classification, compartments)] = _ResourceProfile(classification, compartments)
+            decisions.append(self._decide(profile, **user_args))
+        return decisions
+
+    def specialize(
+        self, resource_classification: ClassificationLevel, resource_compartments: Iterable[Compartment]
+    ) -> Callable[..., AccessDecision]:
+        """Return a decision function bound to one resource classification and compartment set.
+
+        The returned callable takes the user-side keyword arguments of
+        make_access_decision(); resource-side work (rank, compartment mask,
+        portion markings) is done once. Specializations are cached per engine.
+        """
+        key = (resource_classification, tuple(resource_compartments))
+        decide = self._specialized.get(key)
+        if decide is None:
+            decide = self._specialized[key] = partial(self._decide, _ResourceProfile(*key))
+        return decide
+
+    def _decide(
+        self,
+        resource: _ResourceProfile,
+        *,
+        user_id: UUID,
+        user_clearance: ClassificationLevel,
+        user_compartments: Collection[Compartment],
+        user_roles: Collection[str],
+        user_mfa_verified: bool,
+        user_account_suspended: bool,
+        resource_need_to_know_attrs: Optional[Dict[str, Any]] = None,
+        device_posture: str = "unknown",
+        session_active: bool = True,
+    ) -> AccessDecision:
+        # AccessDecision is built with the validated constructor: its list fields are
+        # copied by validation, and model_construct() is slower here because it
+        # inspects every default_factory (decision_id, decided_at) on each call.
+        if isinstance(user_compartments, (set, frozenset)):
+            # Sets have no stable order; record them in declaration order.
+            user_compartments = compartments_from_mask(compartment_mask(user_compartments))
+        else:
+            user_compartments = list(user_compartments)
+        resource_classification = resource.classification
 
         # 1) account
         if user_account_suspended:
@@ -72,7 +218,7 @@ class AccessControlEngine:
                 user_clearance=user_clearance,
                 user_compartments=user_compartments,
                 resource_classification=resource_classification,
-                resource_compartments=resource_compartments,
+                resource_compartments=resource.compartments,
             )
 
         # 2) session
@@ -83,31 +229,33 @@ class AccessControlEngine:
                 user_clearance=user_clearance,
                 user_compartments=user_compartments,
                 resource_classification=resource_classification,
-                resource_compartments=resource_compartments,
+                resource_compartments=resource.compartments,
             )
 
         # 3) clearance
-        if user_clearance.numeric_value < resource_classification.numeric_value:
+        if _CLASSIFICATION_RANK[user_clearance] < resource.rank:
             return AccessDecision(
                 allowed=False,
                 reason=f"Insufficient clearance: user has {user_clearance.value}, resource requires {resource_classification.value}",
                 user_clearance=user_clearance,
                 user_compartments=user_compartments,
                 resource_classification=resource_classification,
-                resource_compartments=resource_compartments,
+                resource_compartments=resource.compartments,
             )
 
-        # 4) compartments
-        if not set(resource_compartments).issubset(set(user_compartments)):
-            missing = set(resource_compartments) - set(user_compartments)
-            return AccessDecision(
-                allowed=False,
-                reason=f"Missing compartments: {', '.join([c.value for c in sorted(missing, key=lambda x: x.value)])}",
-                user_clearance=user_clearance,
-                user_compartments=user_compartments,
-                resource_classification=resource_classification,
-                resource_compartments=resource_compartments,
-            )
+        # 4) compartments (most resources carry none: skip the user mask entirely)
+        if resource.mask:
+            missing_mask = resource.mask & ~compartment_mask(user_compartments)
+            if missing_mask:
+                missing = [value for bit, value in _MISSING_COMPARTMENT_ORDER if missing_mask & bit]
+                return AccessDecision(
+                    allowed=False,
+                    reason=f"Missing compartments: {', '.join(missing)}",
+                    user_clearance=user_clearance,
+                    user_compartments=user_compartments,
+                    resource_classification=resource_classification,
+                    resource_compartments=resource.compartments,
+                )
 
         # 5) need-to-know (simple)
         if resource_need_to_know_attrs:
@@ -118,52 +266,28 @@ class AccessControlEngine:
                     user_clearance=user_clearance,
                     user_compartments=user_compartments,
                     resource_classification=resource_classification,
-                    resource_compartments=resource_compartments,
+                    resource_compartments=resource.compartments,
                 )
 
         # obligations
-        obligations: List[AccessDecisionObligation] = []
-
-        # Device posture → step-up on Secret+
-        if device_posture == "untrusted" and resource_classification.numeric_value >= ClassificationLevel.SECRET.numeric_value:
-            obligations.append(
-                AccessDecisionObligation(
-                    obligation_type=ObligationType.REQUIRE_MFA_STEP_UP,
-                    reason="Device is untrusted; Secret+ data requires additional MFA",
-                )
-            )
-
-        # MFA required on Secret+
-        if resource_classification.numeric_value >= ClassificationLevel.SECRET.numeric_value and not user_mfa_verified:
-            obligations.append(
-                AccessDecisionObligation(
-                    obligation_type=ObligationType.REQUIRE_MFA_STEP_UP,
-                    reason="Secret+ data requires MFA verification",
-                )
-            )
-
-        # Audit on CUI+
-        if resource_classification.numeric_value >= ClassificationLevel.CUI.numeric_value:
-            obligations.append(
-                AccessDecisionObligation(
-                    obligation_type=ObligationType.AUDIT_ACCESS,
-                    reason=f"Accessing {resource_classification.value} data",
-                )
-            )
+        obligation_key = (resource_classification, device_posture == "untrusted", user_mfa_verified)
+        obligations = _OBLIGATIONS_TABLE.get(obligation_key)
+        if obligations is None:
+            obligations = _OBLIGATIONS_TABLE[obligation_key] = _compute_obligations(*obligation_key)
 
         return AccessDecision(
             allowed=True,
             reason="All access control checks passed",
-            obligations=obligations,
+            obligations=list(obligations),
             highest_classification=resource_classification,
-            portion_markings=[f"//{c.value}" for c in resource_compartments],
+            portion_markings=resource.portion_markings,
             user_clearance=user_clearance,
             user_compartments=user_compartments,
             resource_classification=resource_classification,
-            resource_compartments=resource_compartments,
+            resource_compartments=resource.compartments,
         )
 
-    def _check_need_to_know(self, user_roles: List[str], resource_attrs: Dict[str, Any]) -> bool:
+    def _check_need_to_know(self, user_roles: Collection[str], resource_attrs: Dict[str, Any]) -> bool:
         if not resource_attrs:
             return True
 
@@ -175,6 +299,11 @@ class AccessControlEngine:
         # Extend here for sectors, programs, mission tags, etc.
         return True
 
-    def apply_redaction(self, data: Dict[str, Any], user_clearance: ClassificationLevel, user_compartments: List[Compartment]) -> Dict[str, Any]:
-        obligations = self.redaction_engine.compute_obligations(user_clearance, user_compartments)
-        return self.redaction_engine.apply_obligations(data, obligations, user_clearance, user_compartments)
+    def apply_redaction(self, data: Dict[str, Any], user_clearance: ClassificationLevel, user_compartments: Collection[Compartment]) -> Dict[str, Any]:
+        self.redaction_engine.redactor(user_clearance, user_compartments)(data)
+        return data
+
+    def redacted_copy(self, data: Dict[str, Any], user_clearance: ClassificationLevel, user_compartments: Collection[Compartment]) -> Dict[str, Any]:
+        """Like apply_redaction(), but leave data untouched and return a copy sharing its unredacted parts."""
+        redacted: Dict[str, Any] = self.redaction_engine.copying_redactor(user_clearance, user_compartments)(data)
+        return redacted
@@ -0,0 +1,92 @@
+"""Aegis Access Control - vectorized batch checks (optional NumPy/Numba)
+
+Evaluates the fail-secure checks of AccessControlEngine (account, session,
+clearance, compartments) over column arrays, one row per request:
+
+- ranks come from ClassificationLevel.numeric_value
+- compartment sets are masks from base.compartment_mask()
+
+The result is a uint8 reason code per request (0 = allow). Need-to-know and
+obligations stay in AccessControlEngine; use this as a pre-filter for bulk
+listings, then build full decisions only for the rows you return.
+
+Requires numpy. When numba is installed the kernel is JIT-compiled and runs
+in parallel; otherwise an equivalent NumPy expression is used.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray
+
+try:
+    from numba import njit, prange
+
+    _HAS_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    _HAS_NUMBA = False
+
+
+ALLOW = 0
+DENY_ACCOUNT_SUSPENDED = 1
+DENY_SESSION_INACTIVE = 2
+DENY_INSUFFICIENT_CLEARANCE = 3
+DENY_MISSING_COMPARTMENTS = 4
+
+
+def _decide_numpy(
+    user_rank: NDArray[np.int64],
+    user_mask: NDArray[np.int64],
+    resource_rank: NDArray[np.int64],
+    resource_mask: NDArray[np.int64],
+    suspended: NDArray[np.bool_],
+    session_active: NDArray[np.bool_],
+) -> NDArray[np.uint8]:
+    out = np.zeros(user_rank.shape[0], dtype=np.uint8)
+    # Assign in reverse check order so the first failing check wins.
+    out[(resource_mask & ~user_mask) != 0] = DENY_MISSING_COMPARTMENTS
+    out[user_rank < resource_rank] = DENY_INSUFFICIENT_CLEARANCE
+    out[~session_active] = DENY_SESSION_INACTIVE
+    out[suspended] = DENY_ACCOUNT_SUSPENDED
+    return out
+
+
+if _HAS_NUMBA:
+
+    @njit(parallel=True, cache=True)
+    def _decide_jit(user_rank, user_mask, resource_rank, resource_mask, suspended, session_active):  # type: ignore[no-untyped-def]
+        out = np.empty(user_rank.shape[0], np.uint8)
+        for i in prange(user_rank.shape[0]):
+            if suspended[i]:
+                out[i] = DENY_ACCOUNT_SUSPENDED
+            elif not session_active[i]:
+                out[i] = DENY_SESSION_INACTIVE
+            elif user_rank[i] < resource_rank[i]:
+                out[i] = DENY_INSUFFICIENT_CLEARANCE
+            elif (resource_mask[i] & ~user_mask[i]) != 0:
+                out[i] = DENY_MISSING_COMPARTMENTS
+            else:
+                out[i] = ALLOW
+        return out
+
+
+def batch_authorize(
+    user_rank: NDArray[np.int64],
+    user_mask: NDArray[np.int64],
+    resource_rank: NDArray[np.int64],
+    resource_mask: NDArray[np.int64],
+    suspended: NDArray[np.bool_],
+    session_active: NDArray[np.bool_],
+) -> NDArray[np.uint8]:
+    """Return one reason code per request (ALLOW or a DENY_* constant)."""
+    args = (
+        np.asarray(user_rank, dtype=np.int64),
+        np.asarray(user_mask, dtype=np.int64),
+        np.asarray(resource_rank, dtype=np.int64),
+        np.asarray(resource_mask, dtype=np.int64),
+        np.asarray(suspended, dtype=np.bool_),
+        np.asarray(session_active, dtype=np.bool_),
+    )
+    if _HAS_NUMBA:
+        return _decide_jit(*args)  # type: ignore[no-any-return]
+    return _decide_numpy(*args)
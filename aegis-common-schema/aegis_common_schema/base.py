@@ -15,17 +15,31 @@ Notes:
 
 from __future__ import annotations
 
+from functools import cached_property, partial
 from enum import Enum
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any, Set
+from typing import Optional, List, Dict, Any, Set, Iterable, Tuple, Collection, Callable, Mapping, TypeVar
 from uuid import UUID, uuid4
 from pydantic import BaseModel, Field, ConfigDict
+from typing_extensions import Self
 import hashlib
 import json
+import sys
 
 
-def utcnow() -> datetime:
-    return datetime.now(timezone.utc)
+# partial() rather than a def: default_factory calls it without a Python frame.
+utcnow: Callable[[], datetime] = partial(datetime.now, timezone.utc)
+
+
+# Canonical JSON for hashing. A single preconfigured encoder avoids json.dumps()
+# building a new JSONEncoder per call; stdlib json (rather than orjson) keeps
+# digests byte-identical across environments, e.g. for float exponents.
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _canonical_sha256(payload: Any) -> str:
+    serialized = _CANONICAL_JSON.encode(payload)
+    return "sha256:" + hashlib.sha256(serialized.encode("utf-8")).hexdigest()
 
 
 # ============================================================================
@@ -47,31 +61,39 @@ class ClassificationLevel(str, Enum):
 
     @property
     def numeric_value(self) -> int:
-        mapping = {
-            "U": 0,
-            "CUI": 1,
-            "C": 2,
-            "S": 3,
-            "TS": 4,
-            "TS//SCI": 5,
-        }
-        return mapping[self.value]
+        return _CLASSIFICATION_RANK[self]
 
     @property
     def banner_color(self) -> str:
-        # Astro UXDS-style colors (as provided in your spec)
-        mapping = {
-            "U": "#007A33",
-            "CUI": "#502B85",
-            "C": "#0033A0",
-            "S": "#C8102E",
-            "TS": "#FF8C00",
-            "TS//SCI": "#FCE83A",
-        }
-        return mapping[self.value]
+        return _BANNER_COLOR[self]
 
     def can_access(self, required_level: "ClassificationLevel") -> bool:
-        return self.numeric_value >= required_level.numeric_value
+        return _CLASSIFICATION_RANK[self] >= _CLASSIFICATION_RANK[required_level]
+
+
+# Rank/color tables are built once at import; the properties above are hot in
+# access decisions and must not rebuild a mapping per call.
+_CLASSIFICATION_RANK: Dict[ClassificationLevel, int] = {
+    ClassificationLevel.UNCLASSIFIED: 0,
+    ClassificationLevel.CUI: 1,
+    ClassificationLevel.CONFIDENTIAL: 2,
+    ClassificationLevel.SECRET: 3,
+    ClassificationLevel.TOP_SECRET: 4,
+    ClassificationLevel.TS_SCI: 5,
+}
+
+# Value -> member lookup without going through Enum.__call__.
+_CLASSIFICATION_BY_VALUE: Dict[str, ClassificationLevel] = {m.value: m for m in ClassificationLevel}
+
+# Astro UXDS-style colors (as provided in your spec)
+_BANNER_COLOR: Dict[ClassificationLevel, str] = {
+    ClassificationLevel.UNCLASSIFIED: "#007A33",
+    ClassificationLevel.CUI: "#502B85",
+    ClassificationLevel.CONFIDENTIAL: "#0033A0",
+    ClassificationLevel.SECRET: "#C8102E",
+    ClassificationLevel.TOP_SECRET: "#FF8C00",
+    ClassificationLevel.TS_SCI: "#FCE83A",
+}
 
 
 class Compartment(str, Enum):
@@ -89,6 +111,27 @@ class Compartment(str, Enum):
     RUFF = "RUFF"
 
 
+_COMPARTMENT_BY_VALUE: Dict[str, Compartment] = {m.value: m for m in Compartment}
+
+# One bit per compartment: subset/missing checks become a single AND on ints.
+_COMPARTMENT_BIT: Dict[Compartment, int] = {c: 1 << i for i, c in enumerate(Compartment)}
+
+# Shared "//<compartment>" portion marking strings, built once per member.
+_PORTION_MARKING: Dict[Compartment, str] = {c: sys.intern(f"//{c.value}") for c in Compartment}
+
+
+def compartment_mask(compartments: Iterable[Compartment]) -> int:
+    mask = 0
+    for c in compartments:
+        mask |= _COMPARTMENT_BIT[c]
+    return mask
+
+
+def compartments_from_mask(mask: int) -> List[Compartment]:
+    """Decode a mask back to compartments, in declaration order."""
+    return [c for c, bit in _COMPARTMENT_BIT.items() if mask & bit]
+
+
 class ThreatLevel(str, Enum):
     CRITICAL = "critical"
     HIGH = "high"
@@ -98,7 +141,16 @@ class ThreatLevel(str, Enum):
 
     @property
     def numeric_value(self) -> int:
-        return {"critical": 5, "high": 4, "medium": 3, "low": 2, "info": 1}[self.value]
+        return _THREAT_RANK[self]
+
+
+_THREAT_RANK: Dict[ThreatLevel, int] = {
+    ThreatLevel.CRITICAL: 5,
+    ThreatLevel.HIGH: 4,
+    ThreatLevel.MEDIUM: 3,
+    ThreatLevel.LOW: 2,
+    ThreatLevel.INFO: 1,
+}
 
 
 class IncidentState(str, Enum):
@@ -182,10 +234,10 @@ class ClassificationMarking(BaseModel):
     compartments: List[Compartment] = Field(default_factory=list)
     portion_markings: List[str] = Field(default_factory=list)
 
-    def can_be_accessed_by(self, user_clearance: ClassificationLevel, user_compartments: List[Compartment]) -> bool:
+    def can_be_accessed_by(self, user_clearance: ClassificationLevel, user_compartments: Collection[Compartment]) -> bool:
         if not user_clearance.can_access(self.level):
             return False
-        if not set(self.compartments).issubset(set(user_compartments)):
+        if compartment_mask(self.compartments) & ~compartment_mask(user_compartments):
             return False
         return True
 
@@ -217,19 +269,56 @@ class AegisModel(BaseModel):
     tenant_id: Optional[UUID] = None
 
     def update_timestamp(self) -> None:
-        self.updated_at = utcnow()
+        # utcnow() is already a valid aware datetime; skip validate_assignment.
+        object.__setattr__(self, "updated_at", utcnow())
+        self.__pydantic_fields_set__.add("updated_at")
 
     def stable_fingerprint(self, *, exclude: Optional[Set[str]] = None) -> str:
         exclude = set(exclude or set())
         exclude |= {"created_at", "updated_at"}
-        payload = self.model_dump(mode="json", exclude=exclude)
-        serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
-        return "sha256:" + hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        return _canonical_sha256(self.model_dump(mode="json", exclude=exclude))
 
     def compute_hash(self) -> str:
         """Deterministic SHA256 hash of the full model dump (used for chaining)."""
-        serialized = json.dumps(self.model_dump(mode="json"), sort_keys=True, separators=(",", ":"), default=str)
-        return "sha256:" + hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        return _canonical_sha256(self.model_dump(mode="json"))
+
+    def compute_digests(self) -> Tuple[str, str]:
+        """(compute_hash(), stable_fingerprint()) from a single model dump."""
+        payload = self.model_dump(mode="json")
+        full = _canonical_sha256(payload)
+        del payload["created_at"], payload["updated_at"]
+        return full, _canonical_sha256(payload)
+
+
+_M = TypeVar("_M", bound=BaseModel)
+
+
+def _drop_cached_properties(model: _M) -> _M:
+    """Clear cached_property values (stored in __dict__ next to the fields), e.g. on a model_copy()."""
+    for name in model.__dict__.keys() - type(model).model_fields.keys():
+        del model.__dict__[name]
+    return model
+
+
+class FrozenAegisModel(AegisModel):
+    """Immutable AegisModel, hashable by stable_fingerprint().
+
+    Usable as a dict / functools.lru_cache key (e.g. enrichment lookups keyed by
+    a Component). The hash is computed once; do not mutate list/dict fields in
+    place. update_timestamp() stays available and does not change the hash.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    @cached_property
+    def _fingerprint_hash(self) -> int:
+        return hash(self.stable_fingerprint())
+
+    def __hash__(self) -> int:
+        return self._fingerprint_hash
+
+    def model_copy(self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False) -> Self:
+        return _drop_cached_properties(super().model_copy(update=update, deep=deep))
 
 
 # ============================================================================
@@ -256,8 +345,23 @@ class EventEnvelope(BaseModel):
     payload: Dict[str, Any]
 
     def compute_hash(self) -> str:
-        serialized = json.dumps(self.model_dump(mode="json"), sort_keys=True, separators=(",", ":"), default=str)
-        return "sha256:" + hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        return _canonical_sha256(self.model_dump(mode="json"))
+
+
+def compute_hash_chain(envelopes: Iterable[EventEnvelope], prev: Optional[str] = None) -> List[str]:
+    """Link envelopes in order via hash_chain_prev and return each envelope's hash.
+
+    Equivalent to setting hash_chain_prev and calling compute_hash() per envelope,
+    with the encoder/hasher lookups hoisted out of the loop.
+    """
+    encode = _CANONICAL_JSON.encode
+    sha256 = hashlib.sha256
+    hashes: List[str] = []
+    for envelope in envelopes:
+        envelope.hash_chain_prev = prev
+        prev = "sha256:" + sha256(encode(envelope.model_dump(mode="json")).encode("utf-8")).hexdigest()
+        hashes.append(prev)
+    return hashes
 
 
 SCHEMA_VERSION = "1.0.0"
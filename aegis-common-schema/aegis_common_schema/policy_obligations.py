@@ -12,20 +12,32 @@ This is a schema + utility module; enforcement belongs at service boundaries.
 from __future__ import annotations
 
 from enum import Enum
-from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any, Set
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Set, Tuple, Collection, Iterable, Callable
 from uuid import UUID, uuid4
 import hashlib
 import json
 import hmac
+from functools import lru_cache
 
 from pydantic import BaseModel, Field, ConfigDict
 
-from .base import ClassificationLevel, Compartment
+from .base import (
+    ClassificationLevel,
+    Compartment,
+    _CLASSIFICATION_BY_VALUE,
+    _CLASSIFICATION_RANK,
+    _COMPARTMENT_BY_VALUE,
+    _COMPARTMENT_BIT,
+    compartment_mask,
+    utcnow,
+)
 
 
-def utcnow() -> datetime:
-    return datetime.now(timezone.utc)
+@lru_cache(maxsize=32)
+def _hmac_template(signing_key: str) -> hmac.HMAC:
+    # Keyed HMAC with no message yet; copy() reuses the derived inner/outer pads.
+    return hmac.new(signing_key.encode(), b"", hashlib.sha256)
 
 
 class ObligationType(str, Enum):
@@ -54,6 +66,12 @@ class PolicyScope(str, Enum):
     RESOURCE_BASED = "resource_based"
 
 
+@lru_cache(maxsize=256)
+def _compile_field_path(field_path: str) -> Tuple[Tuple[str, bool], ...]:
+    # (key, is_list_wildcard) per "."-separated segment
+    return tuple((part[:-3], True) if part.endswith("[*]") else (part, False) for part in field_path.split("."))
+
+
 class FieldRedactionRule(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -67,12 +85,12 @@ class FieldRedactionRule(BaseModel):
     description: Optional[str] = None
     tags: Dict[str, str] = Field(default_factory=dict)
 
-    def should_redact(self, user_clearance: ClassificationLevel, user_compartments: List[Compartment]) -> bool:
+    def should_redact(self, user_clearance: ClassificationLevel, user_compartments: Collection[Compartment]) -> bool:
         if self.required_clearance is not None:
-            if user_clearance.numeric_value < self.required_clearance.numeric_value:
+            if _CLASSIFICATION_RANK[user_clearance] < _CLASSIFICATION_RANK[self.required_clearance]:
                 return True
         if self.required_compartments:
-            if not set(self.required_compartments).issubset(set(user_compartments)):
+            if compartment_mask(self.required_compartments) & ~compartment_mask(user_compartments):
                 return True
         return False
 
@@ -105,11 +123,11 @@ class PortionRedactionRule(BaseModel):
     description: Optional[str] = None
     tags: Dict[str, str] = Field(default_factory=dict)
 
-    def should_redact(self, user_clearance: ClassificationLevel, user_compartments: List[Compartment]) -> bool:
-        if user_clearance.numeric_value < self.minimum_clearance.numeric_value:
+    def should_redact(self, user_clearance: ClassificationLevel, user_compartments: Collection[Compartment]) -> bool:
+        if _CLASSIFICATION_RANK[user_clearance] < _CLASSIFICATION_RANK[self.minimum_clearance]:
             return True
         if self.required_compartments:
-            if not set(self.required_compartments).issubset(set(user_compartments)):
+            if compartment_mask(self.required_compartments) & ~compartment_mask(user_compartments):
                 return True
         return False
 
@@ -131,7 +149,8 @@ class AccessObligation(BaseModel):
 
 
 class AccessDecisionObligation(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    # Frozen: instances are shared across decisions by the obligation caches.
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     obligation_type: ObligationType
     resource_field: Optional[str] = None
@@ -154,48 +173,86 @@ class ClassificationAggregationResult(BaseModel):
     signature_algorithm: str = "hmac-sha256"
 
     def compute_signature(self, signing_key: str) -> str:
-        # Signature should not depend on computed_at to avoid breaking caching.
-        payload = {
-            "highest_classification": self.highest_classification.value,
-            "all_portion_markings": sorted(self.all_portion_markings),
-            "all_compartments": sorted([c.value for c in self.all_compartments]),
-            "count": self.computed_from_entity_count,
-        }
-        serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-        return hmac.new(signing_key.encode(), serialized.encode(), hashlib.sha256).hexdigest()
+        message = _signature_message(
+            self.highest_classification, self.all_portion_markings, self.all_compartments, self.computed_from_entity_count
+        )
+        return _sign(message, signing_key)
 
     @staticmethod
     def aggregate(entities: List[Dict[str, Any]], signing_key: Optional[str] = None) -> "ClassificationAggregationResult":
-        classifications: List[ClassificationLevel] = []
-        portion_markings_set: Set[str] = set()
-        compartments_set: Set[Compartment] = set()
-
-        for entity in entities:
-            if "classification" in entity and entity["classification"] is not None:
-                c = entity["classification"]
-                classifications.append(c if isinstance(c, ClassificationLevel) else ClassificationLevel(c))
-            if "portion_markings" in entity and entity["portion_markings"]:
-                portion_markings_set.update(entity["portion_markings"])
-            if "compartments" in entity and entity["compartments"]:
-                for comp in entity["compartments"]:
-                    compartments_set.add(comp if isinstance(comp, Compartment) else Compartment(comp))
-
-        highest = max(classifications, key=lambda c: c.numeric_value, default=ClassificationLevel.UNCLASSIFIED)
-
+        # Same entity markings (in order) -> same result and signed message; only
+        # computed_at is per call, so the aggregation is memoized. The HMAC itself
+        # is computed per call, so no signing key is held by the cache.
+        key = tuple(
+            (entity.get("classification"), tuple(entity.get("portion_markings") or ()), tuple(entity.get("compartments") or ()))
+            for entity in entities
+        )
+        highest, classifications, portion_markings, compartments, message = _aggregate_markings(key)
         result = ClassificationAggregationResult(
             highest_classification=highest,
-            all_classifications=classifications,
-            all_portion_markings=sorted(list(portion_markings_set)),
-            all_compartments=sorted(list(compartments_set), key=lambda c: c.value),
+            all_classifications=list(classifications),
+            all_portion_markings=list(portion_markings),
+            all_compartments=list(compartments),
             computed_from_entity_count=len(entities),
         )
-
         if signing_key:
-            result.signature = result.compute_signature(signing_key)
-
+            result.signature = _sign(message, signing_key)
         return result
 
 
+def _signature_message(
+    highest: ClassificationLevel, portion_markings: Iterable[str], compartments: Iterable[Compartment], count: int
+) -> bytes:
+    # Signature should not depend on computed_at to avoid breaking caching.
+    payload = {
+        "highest_classification": highest.value,
+        "all_portion_markings": sorted(portion_markings),
+        "all_compartments": sorted([c.value for c in compartments]),
+        "count": count,
+    }
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _sign(message: bytes, signing_key: str) -> str:
+    mac = _hmac_template(signing_key).copy()
+    mac.update(message)
+    return mac.hexdigest()
+
+
+# (bit, compartment) pairs sorted by value: decodes a union mask to all_compartments order.
+_COMPARTMENTS_BY_VALUE_ORDER = [(_COMPARTMENT_BIT[c], c) for c in sorted(Compartment, key=lambda c: c.value)]
+
+
+@lru_cache(maxsize=4096)
+def _aggregate_markings(
+    entities: Tuple[Tuple[Any, Tuple[str, ...], Tuple[Any, ...]], ...],
+) -> Tuple[ClassificationLevel, Tuple[ClassificationLevel, ...], Tuple[str, ...], Tuple[Compartment, ...], bytes]:
+    classifications: List[ClassificationLevel] = []
+    portion_markings_set: Set[str] = set()
+    compartment_bits = 0
+    highest = ClassificationLevel.UNCLASSIFIED
+    highest_rank = -1
+
+    # Members and raw values both hit the by-value maps (str-valued enums hash
+    # and compare as their value); the Enum constructor only runs to raise on
+    # unknown values.
+    for c, markings, comps in entities:
+        if c is not None:
+            level = _CLASSIFICATION_BY_VALUE.get(c) or ClassificationLevel(c)
+            classifications.append(level)
+            rank = _CLASSIFICATION_RANK[level]
+            if rank > highest_rank:
+                highest, highest_rank = level, rank
+        portion_markings_set.update(markings)
+        for comp in comps:
+            compartment_bits |= _COMPARTMENT_BIT[_COMPARTMENT_BY_VALUE.get(comp) or Compartment(comp)]
+
+    portion_markings = tuple(sorted(portion_markings_set))
+    compartments = tuple(c for bit, c in _COMPARTMENTS_BY_VALUE_ORDER if compartment_bits & bit)
+    message = _signature_message(highest, portion_markings, compartments, len(entities))
+    return highest, tuple(classifications), portion_markings, compartments, message
+
+
 class ClassificationPolicy(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -241,56 +298,219 @@ class AccessDecision(BaseModel):
 # REDACTION ENGINE (Utility)
 # ============================================================================
 
-class RedactionEngine:
-    """Applies redaction rules to response payloads."""
-
-    def __init__(self, policy: ClassificationPolicy):
-        self.policy = policy
-
-    def _set_path_redacted(self, current: Any, parts: List[str], redacted_value: Any) -> bool:
-        if not parts:
-            return False
-
-        head = parts[0]
-        tail = parts[1:]
+# Path trie: segment -> (redacted value if a path ends here, child segments).
+_PathTrie = Dict[Tuple[str, bool], Tuple[Optional[str], "_PathTrie"]]
+
+
+def _build_path_trie(masks: List[Tuple[Tuple[Tuple[str, bool], ...], str]]) -> _PathTrie:
+    root: _PathTrie = {}
+    for path, value in masks:
+        node = root
+        for depth, segment in enumerate(path):
+            terminal, children = node.get(segment, (None, {}))
+            if depth == len(path) - 1:
+                terminal = value  # later rules overwrite earlier ones, as sequential masking did
+            node[segment] = (terminal, children)
+            node = children
+    return root
+
+
+def _compile_path_trie(node: _PathTrie) -> Callable[[Any], None]:
+    """Specialize a path trie into nested closures that mask a payload in place.
+
+    The policy is fixed per engine, so each trie level becomes a closure over
+    its own (key, value) masks and child walkers; no paths are interpreted per
+    request. A masked field is replaced whole (its subtree is not visited), and
+    "[*]" fans out over lists without ever masking the list itself.
+    """
+    masks: List[Tuple[str, str]] = []
+    descents: List[Tuple[str, Callable[[Any], None]]] = []
+    fanouts: List[Tuple[str, Callable[[Any], None]]] = []
+    for (key, wildcard), (terminal, children) in node.items():
+        if wildcard:
+            if children:
+                fanouts.append((key, _compile_path_trie(children)))
+        elif terminal is not None:
+            masks.append((key, terminal))
+        elif children:
+            descents.append((key, _compile_path_trie(children)))
+
+    def redact(data: Any) -> None:
+        if not isinstance(data, dict):
+            return
+        for key, value in masks:
+            if key in data:
+                data[key] = value
+        for key, walk in descents:
+            if key in data:
+                walk(data[key])
+        for key, walk in fanouts:
+            items = data.get(key)
+            if isinstance(items, list):
+                for item in items:
+                    walk(item)
+
+    return redact
+
+
+def _compile_path_trie_copying(node: _PathTrie) -> Callable[[Any], Any]:
+    """Like _compile_path_trie, but return a redacted copy and leave the payload untouched.
+
+    Copy-on-write: only the dicts and lists on a path that actually changes are
+    copied, everything else is shared with the input; a payload with nothing to
+    mask is returned as is.
+    """
+    masks: List[Tuple[str, str]] = []
+    descents: List[Tuple[str, Callable[[Any], Any]]] = []
+    fanouts: List[Tuple[str, Callable[[Any], Any]]] = []
+    for (key, wildcard), (terminal, children) in node.items():
+        if wildcard:
+            if children:
+                fanouts.append((key, _compile_path_trie_copying(children)))
+        elif terminal is not None:
+            masks.append((key, terminal))
+        elif children:
+            descents.append((key, _compile_path_trie_copying(children)))
+
+    def redact(data: Any) -> Any:
+        if not isinstance(data, dict):
+            return data
+        out: Optional[Dict[str, Any]] = None
+        for key, value in masks:
+            if key in data:
+                if out is None:
+                    out = dict(data)
+                out[key] = value
+        # Descents and fan-outs read the partially redacted result, as the in-place
+        # redactor does: a field masked whole above is not walked into again.
+        for key, walk in descents:
+            current = data if out is None else out
+            if key in current:
+                child = current[key]
+                redacted = walk(child)
+                if redacted is not child:
+                    if out is None:
+                        out = dict(data)
+                    out[key] = redacted
+        for key, walk in fanouts:
+            items = (data if out is None else out).get(key)
+            if isinstance(items, list):
+                redacted_items = [walk(item) for item in items]
+                if any(new is not old for new, old in zip(redacted_items, items)):
+                    if out is None:
+                        out = dict(data)
+                    out[key] = redacted_items
+        return data if out is None else out
+
+    return redact
+
+
+def _redact_nothing(data: Any) -> None:
+    return None
+
+
+def _copy_nothing(data: Any) -> Any:
+    return data
 
-        # list wildcard segment: key[*]
-        if head.endswith("[*]"):
-            key = head[:-3]
-            if not isinstance(current, dict) or key not in current or not isinstance(current[key], list):
-                return False
-            changed = False
-            for item in current[key]:
-                changed |= self._set_path_redacted(item, tail, redacted_value)
-            return changed
 
-        if not isinstance(current, dict) or head not in current:
-            return False
+class RedactionEngine:
+    """Applies redaction rules to response payloads.
 
-        if not tail:
-            current[head] = redacted_value
-            return True
+    The policy is compiled at construction into per-clearance rule buckets, and
+    obligations and compiled field redactors are memoized per (clearance,
+    compartment mask). Call invalidate_cache() after mutating the policy in place.
+    """
 
-        return self._set_path_redacted(current[head], tail, redacted_value)
+    def __init__(self, policy: ClassificationPolicy):
+        self.policy = policy
+        self._obligation_cache: Dict[Tuple[ClassificationLevel, int], Tuple[AccessDecisionObligation, ...]] = {}
+        self._compile_policy()
+
+    def invalidate_cache(self) -> None:
+        self._obligation_cache.clear()
+        self._compile_policy()
+
+    def _compile_policy(self) -> None:
+        # Bucket i holds the rules that may fire for a user of rank i, paired with
+        # the compartment mask still to check (None: the clearance gap alone fires it).
+        ranks = range(len(_CLASSIFICATION_RANK))
+        self._field_plan: List[List[Tuple[FieldRedactionRule, Optional[int]]]] = [[] for _ in ranks]
+        self._portion_plan: List[List[Tuple[PortionRedactionRule, Optional[int]]]] = [[] for _ in ranks]
+        # MASK_FIELD obligations name a field_path; index the rules (with their
+        # parsed paths) so redact_field() does not rescan the whole policy.
+        self._rules_by_path: Dict[str, List[Tuple[FieldRedactionRule, Tuple[Tuple[str, bool], ...]]]] = {}
+        # Compiled redactors, keyed by the (path, value) masks they apply and by
+        # the (clearance, compartment mask) whose obligations produce those masks
+        self._redactor_by_masks: Dict[Tuple[Tuple[Tuple[Tuple[str, bool], ...], str], ...], Callable[[Any], None]] = {}
+        self._redactor_cache: Dict[Tuple[ClassificationLevel, int], Callable[[Any], None]] = {}
+        # Same, for the copy-on-write variant (copying_redactor()).
+        self._copying_redactor_by_masks: Dict[Tuple[Tuple[Tuple[Tuple[str, bool], ...], str], ...], Callable[[Any], Any]] = {}
+        self._copying_redactor_cache: Dict[Tuple[ClassificationLevel, int], Callable[[Any], Any]] = {}
 
-    def redact_field(self, data: Dict[str, Any], field_path: str, user_clearance: ClassificationLevel, user_compartments: List[Compartment]) -> Dict[str, Any]:
         for rule in self.policy.field_redaction_rules:
-            if rule.field_path != field_path:
+            self._rules_by_path.setdefault(rule.field_path, []).append((rule, _compile_field_path(rule.field_path)))
+            required_rank = _CLASSIFICATION_RANK[rule.required_clearance] if rule.required_clearance is not None else 0
+            required = compartment_mask(rule.required_compartments)
+            for rank in ranks:
+                if rank < required_rank:
+                    self._field_plan[rank].append((rule, None))
+                elif required:
+                    self._field_plan[rank].append((rule, required))
+
+        for portion_rule in self.policy.portion_redaction_rules:
+            required_rank = _CLASSIFICATION_RANK[portion_rule.minimum_clearance]
+            required = compartment_mask(portion_rule.required_compartments)
+            for rank in ranks:
+                if rank < required_rank:
+                    self._portion_plan[rank].append((portion_rule, None))
+                elif required:
+                    self._portion_plan[rank].append((portion_rule, required))
+
+    def _set_path_redacted(self, data: Any, path: Tuple[Tuple[str, bool], ...], redacted_value: Any) -> bool:
+        # Iterative walk over the compiled path; "[*]" segments fan out over lists.
+        changed = False
+        last = len(path) - 1
+        stack = [(data, 0)]
+        while stack:
+            current, i = stack.pop()
+            key, wildcard = path[i]
+            if not isinstance(current, dict) or key not in current:
                 continue
+            if wildcard:
+                items = current[key]
+                if isinstance(items, list) and i < last:
+                    stack.extend((item, i + 1) for item in items)
+            elif i == last:
+                current[key] = redacted_value
+                changed = True
+            else:
+                stack.append((current[key], i + 1))
+        return changed
+
+    def redact_field(self, data: Dict[str, Any], field_path: str, user_clearance: ClassificationLevel, user_compartments: Collection[Compartment]) -> Dict[str, Any]:
+        for rule, path in self._rules_by_path.get(field_path, ()):
             if not rule.should_redact(user_clearance, user_compartments):
                 continue
-            parts = field_path.split(".")
             redacted_value = rule.apply_redaction(None)
-            self._set_path_redacted(data, parts, redacted_value)
+            self._set_path_redacted(data, path, redacted_value)
         return data
 
-    def compute_obligations(self, user_clearance: ClassificationLevel, user_compartments: List[Compartment]) -> List[AccessDecisionObligation]:
+    def compute_obligations(self, user_clearance: ClassificationLevel, user_compartments: Collection[Compartment]) -> List[AccessDecisionObligation]:
+        key = (user_clearance, compartment_mask(user_compartments))
+        cached = self._obligation_cache.get(key)
+        if cached is None:
+            cached = tuple(self._evaluate_rules(*key))
+            self._obligation_cache[key] = cached
+        return list(cached)
+
+    def _evaluate_rules(self, user_clearance: ClassificationLevel, user_mask: int) -> List[AccessDecisionObligation]:
         obligations: List[AccessDecisionObligation] = []
+        rank = _CLASSIFICATION_RANK[user_clearance]
 
-        for rule in self.policy.field_redaction_rules:
-            if rule.should_redact(user_clearance, user_compartments):
+        for rule, required in self._field_plan[rank]:
+            if required is None or required & ~user_mask:
                 obligations.append(
-                    AccessDecisionObligation(
+                    AccessDecisionObligation.model_construct(
                         obligation_type=ObligationType.MASK_FIELD,
                         resource_field=rule.field_path,
                         redaction_strategy=rule.strategy,
@@ -298,10 +518,10 @@ class RedactionEngine:
                     )
                 )
 
-        for portion_rule in self.policy.portion_redaction_rules:
-            if portion_rule.should_redact(user_clearance, user_compartments):
+        for portion_rule, required in self._portion_plan[rank]:
+            if required is None or required & ~user_mask:
                 obligations.append(
-                    AccessDecisionObligation(
+                    AccessDecisionObligation.model_construct(
                         obligation_type=ObligationType.REDACT_PORTION,
                         resource_field=portion_rule.portion_name,
                         redaction_strategy=portion_rule.strategy,
@@ -311,9 +531,55 @@ class RedactionEngine:
 
         return obligations
 
-    def apply_obligations(self, data: Dict[str, Any], obligations: List[AccessDecisionObligation], user_clearance: ClassificationLevel, user_compartments: List[Compartment]) -> Dict[str, Any]:
+    def apply_obligations(self, data: Dict[str, Any], obligations: List[AccessDecisionObligation], user_clearance: ClassificationLevel, user_compartments: Collection[Compartment]) -> Dict[str, Any]:
         # MVP: apply only field masks; portion removal could be added later.
-        for o in obligations:
-            if o.obligation_type == ObligationType.MASK_FIELD and o.resource_field:
-                data = self.redact_field(data, o.resource_field, user_clearance, user_compartments)
+        self._compiled_redactor(self._field_masks(obligations, user_clearance, user_compartments))(data)
         return data
+
+    def redactor(self, user_clearance: ClassificationLevel, user_compartments: Collection[Compartment]) -> Callable[[Any], None]:
+        """Compiled in-place redaction for this user's obligations, cached per (clearance, compartment mask)."""
+        key = (user_clearance, compartment_mask(user_compartments))
+        redact = self._redactor_cache.get(key)
+        if redact is None:
+            obligations = self.compute_obligations(user_clearance, user_compartments)
+            redact = self._redactor_cache[key] = self._compiled_redactor(self._field_masks(obligations, user_clearance, user_compartments))
+        return redact
+
+    def copying_redactor(self, user_clearance: ClassificationLevel, user_compartments: Collection[Compartment]) -> Callable[[Any], Any]:
+        """Like redactor(), but the callable returns a redacted copy and never mutates its argument.
+
+        Unchanged subtrees are shared with the input, so cached or otherwise
+        shared payloads can be redacted without a deep copy.
+        """
+        key = (user_clearance, compartment_mask(user_compartments))
+        redact = self._copying_redactor_cache.get(key)
+        if redact is None:
+            obligations = self.compute_obligations(user_clearance, user_compartments)
+            masks = self._field_masks(obligations, user_clearance, user_compartments)
+            if not masks:
+                redact = _copy_nothing
+            else:
+                redact = self._copying_redactor_by_masks.get(masks)
+                if redact is None:
+                    redact = self._copying_redactor_by_masks[masks] = _compile_path_trie_copying(_build_path_trie(list(masks)))
+            self._copying_redactor_cache[key] = redact
+        return redact
+
+    def _field_masks(self, obligations: List[AccessDecisionObligation], user_clearance: ClassificationLevel, user_compartments: Collection[Compartment]) -> Tuple[Tuple[Tuple[Tuple[str, bool], ...], str], ...]:
+        masks: List[Tuple[Tuple[Tuple[str, bool], ...], str]] = []
+        seen: Set[str] = set()
+        for o in obligations:
+            if o.obligation_type == ObligationType.MASK_FIELD and o.resource_field and o.resource_field not in seen:
+                seen.add(o.resource_field)
+                for rule, path in self._rules_by_path.get(o.resource_field, ()):
+                    if rule.should_redact(user_clearance, user_compartments):
+                        masks.append((path, rule.apply_redaction(None)))
+        return tuple(masks)
+
+    def _compiled_redactor(self, masks: Tuple[Tuple[Tuple[Tuple[str, bool], ...], str], ...]) -> Callable[[Any], None]:
+        if not masks:
+            return _redact_nothing
+        redact = self._redactor_by_masks.get(masks)
+        if redact is None:
+            redact = self._redactor_by_masks[masks] = _compile_path_trie(_build_path_trie(list(masks)))
+        return redact
@@ -10,20 +10,23 @@ Design goals:
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime
+from functools import cached_property
 from enum import Enum
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Mapping, Optional
 from uuid import UUID
 import hashlib
 import json
+import math
 
-from pydantic import BaseModel, Field, ConfigDict, model_validator
+from pydantic import BaseModel, Field, ConfigDict, computed_field, field_serializer
+from typing_extensions import Self
 
-from .base import AegisModel, ThreatLevel, CVESeverity, VendorRiskTier
+from .base import AegisModel, FrozenAegisModel, ThreatLevel, CVESeverity, VendorRiskTier, utcnow, _CANONICAL_JSON, _drop_cached_properties
 
-
-def utcnow() -> datetime:
-    return datetime.now(timezone.utc)
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import ArrayLike, NDArray
 
 
 class ComponentType(str, Enum):
@@ -50,11 +53,18 @@ class Digest(BaseModel):
     alg: str
     value: str
 
-    def __str__(self) -> str:
+    @cached_property
+    def _text(self) -> str:
         return f"{self.alg}:{self.value}"
 
+    def __str__(self) -> str:
+        return self._text
+
+    def model_copy(self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False) -> Self:
+        return _drop_cached_properties(super().model_copy(update=update, deep=deep))
 
-class Vulnerability(AegisModel):
+
+class Vulnerability(FrozenAegisModel):
     cve_id: str
     cwe_ids: list[str] = Field(default_factory=list)
 
@@ -76,7 +86,7 @@ class Vulnerability(AegisModel):
     is_active: bool = True
 
 
-class Component(AegisModel):
+class Component(FrozenAegisModel):
     component_type: ComponentType
     component_id: str
 
@@ -91,14 +101,30 @@ class Component(AegisModel):
     license_id: Optional[str] = None
     license_compliance: LicenseCompliance = LicenseCompliance.UNKNOWN
 
-    hashes: list[Digest] = Field(default_factory=list)
+    hashes: tuple[Digest, ...] = ()
 
-    known_vulnerabilities: list[UUID] = Field(default_factory=list)
+    known_vulnerabilities: set[UUID] = Field(default_factory=set)
 
     description: Optional[str] = None
     homepage: Optional[str] = None
     repository: Optional[str] = None
 
+    @field_serializer("known_vulnerabilities")
+    def _serialize_known_vulnerabilities(self, value: set[UUID]) -> list[UUID]:
+        return sorted(value)  # sets have no stable order; keep digests deterministic
+
+    @cached_property
+    def hashes_by_alg(self) -> dict[str, str]:
+        """alg -> value index over hashes, for O(1) dedupe/diff lookups."""
+        return {d.alg: d.value for d in self.hashes}
+
+    def has_digest(self, digest: Digest) -> bool:
+        return self.hashes_by_alg.get(digest.alg) == digest.value
+
+
+_RECORD_TIMESTAMPS = {"created_at", "updated_at"}
+_SBOM_DIGEST_EXCLUDE = _RECORD_TIMESTAMPS | {"components", "sbom_digest"}
+
 
 class SBOM(AegisModel):
     sbom_name: str
@@ -121,6 +147,21 @@ class SBOM(AegisModel):
     medium_vulnerabilities: int = 0
     kev_vulnerabilities: int = 0
 
+    def compute_digest(self) -> Digest:
+        """Content digest of the SBOM, suitable for sbom_digest / previous_sbom_hash.
+
+        Canonical JSON of the header and then of each component (in list order),
+        newline-separated, fed to SHA-256 one record at a time so large SBOMs are
+        never serialized as a single document. Record timestamps and sbom_digest
+        itself are excluded.
+        """
+        encode = _CANONICAL_JSON.encode
+        h = hashlib.sha256(encode(self.model_dump(mode="json", exclude=_SBOM_DIGEST_EXCLUDE)).encode("utf-8"))
+        for component in self.components:
+            h.update(b"\n")
+            h.update(encode(component.model_dump(mode="json", exclude=_RECORD_TIMESTAMPS)).encode("utf-8"))
+        return Digest(alg="sha256", value=h.hexdigest())
+
 
 class HardwareComponent(AegisModel):
     component_type: str
@@ -129,10 +170,14 @@ class HardwareComponent(AegisModel):
     serial_number: Optional[str] = None
 
     firmware_version: Optional[str] = None
-    firmware_vulnerabilities: list[UUID] = Field(default_factory=list)
+    firmware_vulnerabilities: set[UUID] = Field(default_factory=set)
 
     description: Optional[str] = None
 
+    @field_serializer("firmware_vulnerabilities")
+    def _serialize_firmware_vulnerabilities(self, value: set[UUID]) -> list[UUID]:
+        return sorted(value)
+
 
 class HBOM(AegisModel):
     hbom_name: str
@@ -146,7 +191,7 @@ class HBOM(AegisModel):
     firmware_vulnerabilities: int = 0
 
 
-class Vendor(AegisModel):
+class Vendor(FrozenAegisModel):
     vendor_name: str
     vendor_aliases: list[str] = Field(default_factory=list)
 
@@ -161,10 +206,25 @@ class Vendor(AegisModel):
     tags: dict[str, str] = Field(default_factory=dict)
 
 
+# Canonical VRSInputs JSON (sorted keys, compact separators) as a fixed bytes
+# template; byte-identical to json.dumps(payload, sort_keys=True, separators=(",", ":")).
+_VRS_INPUTS_JSON = (
+    b'{"asset_criticality":%d,"breach_count":%d,"critical_cve_count":%d,'
+    b'"days_since_sbom_update":%d,"high_cve_count":%d,"incident_count_12mo":%d,'
+    b'"kev_present":%s,"medium_cve_count":%d,"reputation_score":%s}'
+)
+
+
+def _json_float(value: float) -> bytes:
+    # json encodes finite floats with float.__repr__; NaN/Infinity go through the encoder.
+    return (float.__repr__(value) if math.isfinite(value) else json.dumps(value)).encode("ascii")
+
+
 class VRSInputs(BaseModel):
     """Deterministic scoring inputs.
 
-    inputs_hash is computed from a normalized JSON representation.
+    inputs_hash is the SHA-256 of the canonical (sorted-key, compact) JSON
+    of the scoring fields, computed on first access (or serialization).
     """
 
     model_config = ConfigDict(frozen=True)
@@ -181,25 +241,29 @@ class VRSInputs(BaseModel):
     days_since_sbom_update: int = 0
     asset_criticality: int = Field(default=0, ge=0, le=10)
 
-    inputs_hash: str = ""
-
-    @model_validator(mode="after")
-    def _compute_hash(self) -> "VRSInputs":
-        payload = {
-            "critical_cve_count": self.critical_cve_count,
-            "high_cve_count": self.high_cve_count,
-            "medium_cve_count": self.medium_cve_count,
-            "kev_present": self.kev_present,
-            "incident_count_12mo": self.incident_count_12mo,
-            "breach_count": self.breach_count,
-            "reputation_score": round(float(self.reputation_score), 4),
-            "days_since_sbom_update": self.days_since_sbom_update,
-            "asset_criticality": self.asset_criticality,
-        }
-        s = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-        h = hashlib.sha256(s.encode("utf-8")).hexdigest()
-        object.__setattr__(self, "inputs_hash", f"sha256:{h}")
-        return self
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def inputs_hash(self) -> str:
+        s = _VRS_INPUTS_JSON % (
+            self.asset_criticality,
+            self.breach_count,
+            self.critical_cve_count,
+            self.days_since_sbom_update,
+            self.high_cve_count,
+            self.incident_count_12mo,
+            b"true" if self.kev_present else b"false",
+            self.medium_cve_count,
+            _json_float(round(float(self.reputation_score), 4)),
+        )
+        return "sha256:" + hashlib.sha256(s).hexdigest()
+
+    def model_copy(self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False) -> Self:
+        return _drop_cached_properties(super().model_copy(update=update, deep=deep))
+
+
+# calculate_scores_batch(): np.digitize() bucket i maps to _TIERS_ASCENDING[i]
+_TIER_THRESHOLDS = (4.0, 6.0, 8.0)
+_TIERS_ASCENDING = (VendorRiskTier.LOW, VendorRiskTier.MEDIUM, VendorRiskTier.HIGH, VendorRiskTier.CRITICAL)
 
 
 class VendorRiskScore(AegisModel):
@@ -247,6 +311,47 @@ class VendorRiskScore(AegisModel):
 
         return round(vrs, 2), round(cve_risk, 2), round(vendor_history, 2), round(freshness, 2), round(criticality, 2), tier
 
+    @staticmethod
+    def calculate_scores_batch(
+        critical_cve_count: ArrayLike,
+        high_cve_count: ArrayLike,
+        medium_cve_count: ArrayLike,
+        kev_present: ArrayLike,
+        incident_count_12mo: ArrayLike,
+        breach_count: ArrayLike,
+        reputation_score: ArrayLike,
+        days_since_sbom_update: ArrayLike,
+        asset_criticality: ArrayLike,
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64], NDArray[np.float64], NDArray[np.float64], NDArray[np.object_]]:
+        """Vectorized calculate_scores() over column arrays (one row per vendor).
+
+        Requires numpy. Scores are returned unrounded (numpy's rounding differs
+        from round() at half-way values); tiers are exact.
+        """
+        import numpy as np
+
+        crit = np.asarray(critical_cve_count, dtype=np.int64)
+        high = np.asarray(high_cve_count, dtype=np.int64)
+        med = np.asarray(medium_cve_count, dtype=np.int64)
+        total = np.maximum(1, crit + high + med)
+        base = (crit * 5 + high * 3 + med) / total
+        cve_risk = np.minimum(10.0, base + np.where(np.asarray(kev_present, dtype=np.bool_), 2.0, 0.0))
+
+        inc = np.asarray(incident_count_12mo, dtype=np.int64)
+        breach = np.asarray(breach_count, dtype=np.int64)
+        hist_total = np.maximum(1, inc + breach)
+        hist_base = (inc * 2 + breach * 3) / hist_total
+        rep_bonus = (np.asarray(reputation_score, dtype=np.float64) / 10.0) * 5.0
+        vendor_history = np.minimum(10.0, hist_base + rep_bonus)
+
+        freshness = np.maximum(0.0, 10.0 - (np.asarray(days_since_sbom_update, dtype=np.int64) / 30.0))
+        criticality = np.asarray(asset_criticality, dtype=np.float64)
+
+        vrs = (cve_risk * 0.35) + (vendor_history * 0.25) + (freshness * 0.20) + (criticality * 0.20)
+        tier = np.take(np.array(_TIERS_ASCENDING, dtype=object), np.digitize(vrs, _TIER_THRESHOLDS))
+
+        return vrs, cve_risk, vendor_history, freshness, criticality, tier
+
 
 class SBOMDiffAlert(AegisModel):
     alert_type: str
@@ -0,0 +1,211 @@
+"""Demo auth context: the X-User-*/X-Device-*/X-Session-* headers, parsed once per request.
+
+AuthContextMiddleware is a pure ASGI middleware: unlike BaseHTTPMiddleware it
+allocates no Request object and spawns no child task. It walks
+scope["headers"] once and keeps the auth headers, still unparsed, in
+scope["state"]. They are parsed on first use by get_auth_context, and the
+resulting AuthContext is stored in scope["state"]["aegis"]; route handlers and
+other dependencies get that same object through Depends(get_auth_context).
+Routes that never ask for it (/health, /docs, ...) do not parse the headers,
+so a malformed header cannot fail them.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from aegis_common_schema.base import (
+    ClassificationLevel,
+    Compartment,
+    RoleType,
+    _CLASSIFICATION_BY_VALUE,
+    _COMPARTMENT_BY_VALUE,
+)
+
+
+# ASGI servers lowercase header names.
+_AUTH_HEADERS = frozenset(
+    {
+        b"x-user-id",
+        b"x-user-clearance",
+        b"x-user-compartments",
+        b"x-user-roles",
+        b"x-user-mfa-verified",
+        b"x-user-suspended",
+        b"x-device-posture",
+        b"x-session-active",
+        b"x-aegis-context",
+    }
+)
+
+# X-Aegis-Context packs the auth headers into one, for clients (load generators)
+# that would rather send one header than eight:
+#   X-Aegis-Context: cl=S;cmp=NOFORN,HUMINT;roles=analyst;mfa=1;susp=0;dev=trusted;sess=1
+_PACKED_FIELDS = {
+    "uid": b"x-user-id",
+    "cl": b"x-user-clearance",
+    "cmp": b"x-user-compartments",
+    "roles": b"x-user-roles",
+    "mfa": b"x-user-mfa-verified",
+    "susp": b"x-user-suspended",
+    "dev": b"x-device-posture",
+    "sess": b"x-session-active",
+}
+
+# The boolean auth headers, packed into the context's "flags" int. Bits are set
+# for the non-default (deny-leaning) values, so a default request has flags == 0.
+USER_SUSPENDED = 1
+SESSION_INACTIVE = 2
+MFA_UNVERIFIED = 4
+
+# (header, display name, bit, header value that sets the bit)
+_FLAG_HEADERS = (
+    (b"x-user-suspended", "X-User-Suspended", USER_SUSPENDED, True),
+    (b"x-session-active", "X-Session-Active", SESSION_INACTIVE, False),
+    (b"x-user-mfa-verified", "X-User-MFA-Verified", MFA_UNVERIFIED, False),
+)
+
+# Same spellings pydantic accepts for a bool header.
+_TRUE_VALUES = frozenset({"1", "on", "t", "true", "y", "yes"})
+_FALSE_VALUES = frozenset({"0", "off", "f", "false", "n", "no"})
+
+
+def _parse_bool(name: str, raw: str) -> bool:
+    value = raw.strip().lower()
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid boolean header {name}: {raw!r}")
+
+
+def _parse_clearance(raw: str) -> ClassificationLevel:
+    # One dict lookup; the engine then compares integer ranks (_CLASSIFICATION_RANK).
+    clearance = _CLASSIFICATION_BY_VALUE.get(raw.strip())
+    if clearance is None:
+        raise ValueError(f"Invalid clearance header X-User-Clearance: {raw!r}")
+    return clearance
+
+
+# Canonical (interned) strings for the known roles: parsed roles are the same
+# objects across requests, so membership tests hit CPython's identity fast path.
+# Unknown roles are kept as sent rather than interned (the intern table would
+# otherwise grow with whatever clients send).
+_ROLE_BY_VALUE: Dict[str, str] = {sys.intern(r.value): sys.intern(r.value) for r in RoleType}
+
+
+def _parse_roles(raw: str) -> FrozenSet[str]:
+    return frozenset(_ROLE_BY_VALUE.get(t, t) for x in raw.split(",") if (t := x.strip()))
+
+
+_NO_COMPARTMENTS: FrozenSet[Compartment] = frozenset()
+
+
+def _parse_compartments(raw: Optional[str]) -> FrozenSet[Compartment]:
+    """
+    Accepts "NOFORN,HUMINT" -> frozenset({Compartment.NOFORN, Compartment.HUMINT})
+
+    Split once per request; a frozenset gives O(1) membership tests and is
+    hashable, so it can key caches directly. Members are the Compartment
+    singletons, so tokens are canonical objects without interning.
+    """
+    if not raw:
+        return _NO_COMPARTMENTS
+    return frozenset(_COMPARTMENT_BY_VALUE.get(t) or Compartment(t) for x in raw.split(",") if (t := x.strip()))
+
+
+def _unpack_context(raw: str) -> Dict[bytes, str]:
+    headers: Dict[bytes, str] = {}
+    for part in raw.split(";"):
+        if not part.strip():
+            continue
+        field, sep, value = part.partition("=")
+        name = _PACKED_FIELDS.get(field.strip())
+        if name is None or not sep:
+            raise ValueError(f"Invalid X-Aegis-Context field: {part!r}")
+        headers[name] = value
+    return headers
+
+
+@dataclass(frozen=True, slots=True)
+class AuthContext:
+    """Typed auth context of one request, parsed once by get_auth_context."""
+
+    user_id: UUID
+    user_clearance: ClassificationLevel
+    user_compartments: FrozenSet[Compartment]
+    user_roles: FrozenSet[str]
+    device_posture: str
+    # USER_SUSPENDED | SESSION_INACTIVE | MFA_UNVERIFIED
+    flags: int
+
+
+def parse_auth_headers(headers: Dict[bytes, str]) -> AuthContext:
+    """Build the demo auth context from the (lowercased) auth headers of a request.
+
+    Fields of a packed X-Aegis-Context header fill in for the individual headers;
+    an individual header, when also sent, wins. Missing headers take the demo
+    defaults: a trusted, MFA-verified SECRET analyst with an active session.
+    Raises ValueError on malformed values.
+    """
+    packed = headers.get(b"x-aegis-context")
+    if packed is not None:
+        headers = {**_unpack_context(packed), **headers}
+    flags = 0
+    for name, display_name, bit, sets_bit in _FLAG_HEADERS:
+        raw = headers.get(name)
+        if raw is not None and _parse_bool(display_name, raw) is sets_bit:
+            flags |= bit
+
+    raw_user_id = headers.get(b"x-user-id")
+    return AuthContext(
+        user_id=UUID(raw_user_id) if raw_user_id else uuid4(),
+        user_clearance=_parse_clearance(headers.get(b"x-user-clearance", ClassificationLevel.SECRET.value)),
+        user_compartments=_parse_compartments(headers.get(b"x-user-compartments")),
+        user_roles=_parse_roles(headers.get(b"x-user-roles", RoleType.ANALYST.value)),
+        device_posture=headers.get(b"x-device-posture", "trusted"),
+        flags=flags,
+    )
+
+
+class AuthContextMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # A repeated header keeps its first value, as Starlette's headers.get does.
+        headers: Dict[bytes, str] = {}
+        for name, value in scope["headers"]:
+            if name in _AUTH_HEADERS and name not in headers:
+                headers[name] = value.decode("latin-1")
+        # Starlette's request.state is a view over scope["state"].
+        scope.setdefault("state", {})["aegis_headers"] = headers
+        await self.app(scope, receive, send)
+
+
+async def get_auth_context(request: Request) -> AuthContext:
+    """Dependency returning the request's AuthContext (async: no threadpool hop).
+
+    Parses the headers kept by AuthContextMiddleware on the first call of a
+    request and caches the result; a malformed header is a 422.
+    """
+    state = request.scope["state"]
+    context: Optional[AuthContext] = state.get("aegis")
+    if context is None:
+        try:
+            context = parse_auth_headers(state["aegis_headers"])
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        state["aegis"] = context
+    return context
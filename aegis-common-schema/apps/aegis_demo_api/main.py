@@ -1,55 +1,61 @@
 from __future__ import annotations
 
-from uuid import UUID, uuid4
-from typing import List, Optional
+import json
+from functools import lru_cache
+from typing import Annotated, Any, Dict, FrozenSet, Tuple
+from uuid import UUID, uuid5
 
-from fastapi import FastAPI, Header, Response
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, Path, Response
 
 from aegis_common_schema.base import ClassificationLevel, Compartment
-
-from .security_context import evaluate_and_render
+from aegis_common_schema.policy_obligations import AccessDecisionObligation
+
+from .auth_context import (
+    MFA_UNVERIFIED,
+    SESSION_INACTIVE,
+    USER_SUSPENDED,
+    AuthContext,
+    AuthContextMiddleware,
+    get_auth_context,
+)
+from .security_context import classification_headers, render_allowed, specialized_access
 
 app = FastAPI(title="Aegis Demo API", version="0.1.0")
+app.add_middleware(AuthContextMiddleware)
 
 
-def _parse_compartments(raw: Optional[str]) -> List[Compartment]:
-    """
-    Accepts "NOFORN,HUMINT" -> [Compartment.NOFORN, Compartment.HUMINT]
-    """
-    if not raw:
-        return []
-    items = [x.strip() for x in raw.split(",") if x.strip()]
-    return [Compartment(i) for i in items]
-
-
-@app.get("/health")
-def health():
-    return {"ok": True}
-
-
-@app.get("/demo/incidents/{incident_id}")
-def get_demo_incident(
-    incident_id: UUID,
-    response: Response,
-    # demo "auth context" via headers (replace with JWT later)
-    x_user_id: Optional[UUID] = Header(default=None),
-    x_user_clearance: str = Header(default=ClassificationLevel.SECRET.value),
-    x_user_compartments: Optional[str] = Header(default=None),
-    x_user_roles: Optional[str] = Header(default="analyst"),
-    x_user_mfa_verified: bool = Header(default=True),
-    x_user_suspended: bool = Header(default=False),
-    x_device_posture: str = Header(default="trusted"),
-    x_session_active: bool = Header(default=True),
-):
-    user_id = x_user_id or uuid4()
-    user_clearance = ClassificationLevel(x_user_clearance)
-    user_compartments = _parse_compartments(x_user_compartments)
-    user_roles = [r.strip() for r in (x_user_roles or "").split(",") if r.strip()]
+# Pre-encoded body; the Response itself is built per call, since FastAPI
+# attaches the request's background tasks to the response a handler returns.
+_HEALTH_BODY = b'{"ok":true}'
+
+
+@app.get("/health", response_model=None)
+async def health() -> Response:
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+
+# Canonical hyphenated UUIDs only; checked by the route's validator, so the
+# handler never constructs a UUID.
+_UUID_PATTERN = r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+_SIGNING_KEY = "demo-signing-key"  # replace with Vault later
+# Every demo incident is the same SECRET//NOFORN resource.
+_RESOURCE_CLASSIFICATION = ClassificationLevel.SECRET
+_RESOURCE_COMPARTMENTS = [Compartment.NOFORN]
+# Resource-side decision work is done once, not per request.
+_decide_incident_access = specialized_access(_RESOURCE_CLASSIFICATION, _RESOURCE_COMPARTMENTS, _SIGNING_KEY)
+
+
+def _encode_json(content: Any) -> bytes:
+    # Same encoding as Starlette's JSONResponse.
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
 
+@lru_cache(maxsize=128)
+def _incident_payload(incident_id: str) -> Dict[str, Any]:
+    """Snapshot of a demo incident, built once per id and shared: never mutate it."""
     # Demo payload includes a related alert at higher classification to prove banner aggregation
-    incident_payload = {
-        "id": str(incident_id),
+    return {
+        "id": incident_id,
         "title": "Phishing Campaign (Demo)",
         "classification": ClassificationLevel.SECRET.value,
         "portion_markings": ["//NOFORN"],
@@ -62,7 +68,8 @@ def get_demo_incident(
         },
         "related_alerts": [
             {
-                "id": str(uuid4()),
+                # Derived from the incident id so a rendered incident is reproducible (and cacheable).
+                "id": str(uuid5(UUID(incident_id), "related-alert")),
                 "classification": ClassificationLevel.TOP_SECRET.value,
                 "portion_markings": ["//HUMINT"],
                 "compartments": [Compartment.HUMINT],
@@ -71,25 +78,76 @@ def get_demo_incident(
         ],
     }
 
-    allowed, reason, headers, body = evaluate_and_render(
-        user_id=user_id,
+
+@lru_cache(maxsize=128)
+def _banner_headers(incident_id: str) -> Dict[str, str]:
+    """Classification banner of an incident, aggregated once per incident.
+
+    Redaction never drops a marked portion, so every rendering of an incident
+    carries the same banner. Callers must not mutate the returned headers.
+    """
+    return classification_headers(_incident_payload(incident_id), signing_key=_SIGNING_KEY)
+
+
+@lru_cache(maxsize=128)
+def _render_incident(
+    incident_id: str,
+    user_clearance: ClassificationLevel,
+    user_compartments: FrozenSet[Compartment],
+    obligations: Tuple[AccessDecisionObligation, ...],
+) -> bytes:
+    """Serialized body of an allowed incident read.
+
+    The response depends only on the incident, what the user may see
+    (clearance and compartments, for redaction) and the decision's obligations;
+    decisions themselves are still made on every request.
+    """
+    body = render_allowed(
+        obligations,
         user_clearance=user_clearance,
         user_compartments=user_compartments,
-        user_roles=user_roles,
-        user_mfa_verified=x_user_mfa_verified,
-        user_account_suspended=x_user_suspended,
-        device_posture=x_device_posture,
-        session_active=x_session_active,
-        resource_classification=ClassificationLevel.SECRET,
-        resource_compartments=[Compartment.NOFORN],
-        incident_payload=incident_payload,
-        signing_key="demo-signing-key",  # replace with Vault later
+        incident_payload=_incident_payload(incident_id),
+        signing_key=_SIGNING_KEY,
+    )
+    return _encode_json(body)
+
+
+@lru_cache(maxsize=128)
+def _denied_body(reason: str) -> bytes:
+    return _encode_json({"error": reason})
+
+
+@app.get("/demo/incidents/{incident_id}", response_model=None)
+async def get_demo_incident(
+    incident_id: Annotated[str, Path(pattern=_UUID_PATTERN)],
+    # demo "auth context" via headers (replace with JWT later), parsed by get_auth_context
+    ctx: Annotated[AuthContext, Depends(get_auth_context)],
+) -> Response:
+    flags = ctx.flags
+    decision = _decide_incident_access(
+        user_id=ctx.user_id,
+        user_clearance=ctx.user_clearance,
+        user_compartments=ctx.user_compartments,
+        user_roles=ctx.user_roles,
+        user_mfa_verified=not flags & MFA_UNVERIFIED,
+        user_account_suspended=bool(flags & USER_SUSPENDED),
+        device_posture=ctx.device_posture,
+        session_active=not flags & SESSION_INACTIVE,
     )
 
-    if not allowed:
-        return JSONResponse(status_code=403, content=body)
+    if not decision.allowed:
+        return Response(content=_denied_body(decision.reason), status_code=403, media_type="application/json")
+
+    # Apply redaction AFTER allow
+    incident_key = incident_id.lower()  # the form str(UUID(...)) gives
+    content = _render_incident(incident_key, ctx.user_clearance, ctx.user_compartments, tuple(decision.obligations))
+    return Response(content=content, media_type="application/json", headers=_banner_headers(incident_key))
+
 
-    for k, v in headers.items():
-        response.headers[k] = v
+if __name__ == "__main__":
+    # python -m apps.aegis_demo_api.main
+    # uvicorn[standard] (a runtime dependency) ships uvloop and httptools: use the
+    # libuv event loop and the C HTTP parser rather than asyncio's loop and h11.
+    import uvicorn
 
-    return body
+    uvicorn.run(app, host="127.0.0.1", port=8000, loop="uvloop", http="httptools", access_log=False)
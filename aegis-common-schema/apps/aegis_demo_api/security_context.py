@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Collection, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 from aegis_common_schema.base import ClassificationLevel, Compartment
 from aegis_common_schema.policy_obligations import (
+    AccessDecision,
+    AccessDecisionObligation,
     ClassificationAggregationResult,
     ClassificationPolicy,
     FieldRedactionRule,
@@ -30,29 +32,33 @@ def build_demo_policy() -> ClassificationPolicy:
     return policy
 
 
-def evaluate_and_render(
+# The demo policy is static: build it (and one engine per signing key) once.
+_DEMO_POLICY = build_demo_policy()
+_DEMO_ENGINE_CACHE: Dict[Optional[str], AccessControlEngine] = {}
+
+
+def _demo_engine(signing_key: Optional[str]) -> AccessControlEngine:
+    engine = _DEMO_ENGINE_CACHE.get(signing_key)
+    if engine is None:
+        engine = _DEMO_ENGINE_CACHE[signing_key] = AccessControlEngine(_DEMO_POLICY, signing_key=signing_key)
+    return engine
+
+
+def evaluate_access(
     *,
     user_id: UUID,
     user_clearance: ClassificationLevel,
-    user_compartments: List[Compartment],
-    user_roles: List[str],
+    user_compartments: Collection[Compartment],
+    user_roles: Collection[str],
     user_mfa_verified: bool,
     user_account_suspended: bool,
     device_posture: str,
     session_active: bool,
     resource_classification: ClassificationLevel,
     resource_compartments: List[Compartment],
-    incident_payload: Dict[str, Any],
     signing_key: str | None = None,
-) -> Tuple[bool, str, Dict[str, str], Dict[str, Any]]:
-    """
-    Returns:
-      allowed, reason, headers, body
-    """
-    policy = build_demo_policy()
-    engine = AccessControlEngine(policy, signing_key=signing_key)
-
-    decision = engine.make_access_decision(
+) -> AccessDecision:
+    return _demo_engine(signing_key).make_access_decision(
         user_id=user_id,
         user_clearance=user_clearance,
         user_compartments=user_compartments,
@@ -65,33 +71,27 @@ def evaluate_and_render(
         session_active=session_active,
     )
 
-    if not decision.allowed:
-        return False, decision.reason, {}, {"error": decision.reason}
-
-    # Apply redaction AFTER allow
-    redacted = engine.apply_redaction(
-        incident_payload,
-        user_clearance=user_clearance,
-        user_compartments=user_compartments,
-    )
 
-    # Banner must reflect highest classification of what you return (aggregation)
+def classification_headers(payload: Dict[str, Any], signing_key: str | None = None) -> Dict[str, str]:
+    """Banner headers aggregated over an incident payload and its related alerts."""
+    # Banner must reflect highest classification of what you return (aggregation).
+    # aggregate() resolves raw classification values itself (by-value lookup).
     entities_for_agg = []
 
     # incident itself
     entities_for_agg.append(
         {
-            "classification": ClassificationLevel(redacted.get("classification", ClassificationLevel.UNCLASSIFIED.value)),
-            "portion_markings": redacted.get("portion_markings", []),
-            "compartments": redacted.get("compartments", []),
+            "classification": payload.get("classification", ClassificationLevel.UNCLASSIFIED),
+            "portion_markings": payload.get("portion_markings", []),
+            "compartments": payload.get("compartments", []),
         }
     )
 
     # related alerts (if any)
-    for a in redacted.get("related_alerts", []) or []:
+    for a in payload.get("related_alerts", []) or []:
         entities_for_agg.append(
             {
-                "classification": ClassificationLevel(a.get("classification", ClassificationLevel.UNCLASSIFIED.value)),
+                "classification": a.get("classification", ClassificationLevel.UNCLASSIFIED),
                 "portion_markings": a.get("portion_markings", []),
                 "compartments": a.get("compartments", []),
             }
@@ -105,8 +105,90 @@ def evaluate_and_render(
     }
     if agg.signature:
         headers["X-Classification-Signature"] = agg.signature
+    return headers
+
+
+def specialized_access(
+    resource_classification: ClassificationLevel,
+    resource_compartments: List[Compartment],
+    signing_key: str | None = None,
+) -> Callable[..., AccessDecision]:
+    """evaluate_access() bound to one resource: takes only the user-side keyword arguments.
+
+    The resource-side work is done once (AccessControlEngine.specialize()).
+    """
+    return _demo_engine(signing_key).specialize(resource_classification, resource_compartments)
+
+
+def render_allowed(
+    obligations: Sequence[AccessDecisionObligation],
+    *,
+    user_clearance: ClassificationLevel,
+    user_compartments: Collection[Compartment],
+    incident_payload: Dict[str, Any],
+    signing_key: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Redacted copy of incident_payload for an allowed decision carrying obligations.
+
+    incident_payload is never mutated: the copy shares every unredacted part
+    with it. Field redaction masks leaf values and never drops a marked portion,
+    so the classification headers of the result equal those of the input.
+    """
+    redacted = _demo_engine(signing_key).redacted_copy(
+        incident_payload,
+        user_clearance=user_clearance,
+        user_compartments=user_compartments,
+    )
 
     # Optional: expose obligations for demo visibility
-    redacted["_access_obligations"] = [o.model_dump(mode="json") for o in decision.obligations]
+    redacted = {**redacted, "_access_obligations": [o.model_dump(mode="json") for o in obligations]}
+
+    return redacted
+
 
-    return True, decision.reason, headers, redacted
+def evaluate_and_render(
+    *,
+    user_id: UUID,
+    user_clearance: ClassificationLevel,
+    user_compartments: Collection[Compartment],
+    user_roles: Collection[str],
+    user_mfa_verified: bool,
+    user_account_suspended: bool,
+    device_posture: str,
+    session_active: bool,
+    resource_classification: ClassificationLevel,
+    resource_compartments: List[Compartment],
+    incident_payload: Dict[str, Any],
+    signing_key: str | None = None,
+) -> Tuple[bool, str, Dict[str, str], Dict[str, Any]]:
+    """
+    Returns:
+      allowed, reason, headers, body
+    """
+    decision = evaluate_access(
+        user_id=user_id,
+        user_clearance=user_clearance,
+        user_compartments=user_compartments,
+        user_roles=user_roles,
+        user_mfa_verified=user_mfa_verified,
+        user_account_suspended=user_account_suspended,
+        device_posture=device_posture,
+        session_active=session_active,
+        resource_classification=resource_classification,
+        resource_compartments=resource_compartments,
+        signing_key=signing_key,
+    )
+
+    if not decision.allowed:
+        return False, decision.reason, {}, {"error": decision.reason}
+
+    # Apply redaction AFTER allow
+    body = render_allowed(
+        decision.obligations,
+        user_clearance=user_clearance,
+        user_compartments=user_compartments,
+        incident_payload=incident_payload,
+        signing_key=signing_key,
+    )
+    return True, decision.reason, classification_headers(body, signing_key=signing_key), body
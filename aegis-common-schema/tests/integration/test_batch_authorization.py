@@ -0,0 +1,75 @@
+"""Integration tests: vectorized batch checks agree with AccessControlEngine."""
+
+from uuid import uuid4
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aegis_common_schema.base import ClassificationLevel, Compartment, compartment_mask
+from aegis_common_schema.policy_obligations import ClassificationPolicy
+from aegis_common_schema.access_control_engine import AccessControlEngine
+from aegis_common_schema import access_control_numba as acn
+
+REQUESTS = [
+    # (clearance, user compartments, resource level, resource compartments, suspended, session active)
+    (ClassificationLevel.SECRET, [Compartment.NOFORN], ClassificationLevel.SECRET, [Compartment.NOFORN], False, True),
+    (ClassificationLevel.SECRET, [Compartment.NOFORN], ClassificationLevel.SECRET, [Compartment.NOFORN], True, False),
+    (ClassificationLevel.SECRET, [Compartment.NOFORN], ClassificationLevel.SECRET, [], False, False),
+    (ClassificationLevel.CUI, [Compartment.NOFORN], ClassificationLevel.SECRET, [Compartment.HUMINT], False, True),
+    (ClassificationLevel.TOP_SECRET, [Compartment.NOFORN], ClassificationLevel.SECRET, [Compartment.HUMINT], False, True),
+    (ClassificationLevel.TS_SCI, [], ClassificationLevel.UNCLASSIFIED, [], False, True),
+]
+
+EXPECTED_REASONS = {
+    acn.DENY_ACCOUNT_SUSPENDED: "suspended",
+    acn.DENY_SESSION_INACTIVE: "not active",
+    acn.DENY_INSUFFICIENT_CLEARANCE: "Insufficient clearance",
+    acn.DENY_MISSING_COMPARTMENTS: "Missing compartments",
+}
+
+
+@pytest.fixture(scope="module")
+def columns():
+    return (
+        np.array([r[0].numeric_value for r in REQUESTS]),
+        np.array([compartment_mask(r[1]) for r in REQUESTS]),
+        np.array([r[2].numeric_value for r in REQUESTS]),
+        np.array([compartment_mask(r[3]) for r in REQUESTS]),
+        np.array([r[4] for r in REQUESTS]),
+        np.array([r[5] for r in REQUESTS]),
+    )
+
+
+def _engine_decisions():
+    engine = AccessControlEngine(ClassificationPolicy(policy_name="Batch Policy"))
+    return [
+        engine.make_access_decision(
+            user_id=uuid4(),
+            user_clearance=clearance,
+            user_compartments=user_comps,
+            user_roles=["analyst"],
+            user_mfa_verified=True,
+            user_account_suspended=suspended,
+            resource_classification=level,
+            resource_compartments=res_comps,
+            session_active=active,
+        )
+        for clearance, user_comps, level, res_comps, suspended, active in REQUESTS
+    ]
+
+
+@pytest.mark.parametrize("kernel", [acn.batch_authorize, acn._decide_numpy])
+def test_batch_authorize_matches_engine(kernel, columns):
+    codes = kernel(*columns)
+
+    for code, decision in zip(codes.tolist(), _engine_decisions()):
+        assert decision.allowed == (code == acn.ALLOW)
+        if code != acn.ALLOW:
+            assert EXPECTED_REASONS[code] in decision.reason
+
+
+def test_jit_kernel_matches_numpy(columns):
+    pytest.importorskip("numba")
+
+    assert acn._decide_jit(*columns).tolist() == acn._decide_numpy(*columns).tolist()
@@ -5,6 +5,9 @@ Run:
   pytest -q
 """
 
+import hashlib
+import hmac
+
 import pytest
 from uuid import uuid4
 
@@ -20,6 +23,47 @@ from aegis_common_schema.policy_obligations import (
 from aegis_common_schema.access_control_engine import AccessControlEngine
 
 
+# Module-scoped: tests only read these (mutating tests work on copies).
+@pytest.fixture(scope="module")
+def engine():
+    return AccessControlEngine(ClassificationPolicy(policy_name="Test Policy"))
+
+
+@pytest.fixture(scope="module")
+def policy_with_redaction():
+    policy = ClassificationPolicy(policy_name="Redaction Policy")
+
+    policy.field_redaction_rules.append(
+        FieldRedactionRule(
+            field_path="user.email",
+            field_type="email",
+            strategy=RedactionStrategy.MASK_WITH_BRACKETS,
+            required_clearance=ClassificationLevel.SECRET,
+        )
+    )
+
+    policy.field_redaction_rules.append(
+        FieldRedactionRule(
+            field_path="incident.affected_users[*].email",
+            field_type="email",
+            strategy=RedactionStrategy.MASK_WITH_BRACKETS,
+            required_clearance=ClassificationLevel.SECRET,
+            required_compartments=[Compartment.HUMINT],
+        )
+    )
+
+    policy.portion_redaction_rules.append(
+        PortionRedactionRule(
+            portion_name="classified_section",
+            portion_marking="//TS//SCI",
+            minimum_clearance=ClassificationLevel.TS_SCI,
+            strategy=RedactionStrategy.REMOVE_FIELD,
+        )
+    )
+
+    return policy
+
+
 class TestClassificationAggregation:
     def test_aggregate_multiple_classifications(self):
         entities = [
@@ -34,6 +78,22 @@ class TestClassificationAggregation:
         assert len(result.all_classifications) == 3
         assert set(result.all_portion_markings) == {"//NOFORN", "//HUMINT", "//NOCONTRACT"}
 
+    def test_aggregate_coerces_raw_values(self):
+        entities = [
+            {"classification": "S", "compartments": ["NOFORN"]},
+            {"classification": "TS", "compartments": [Compartment.HUMINT]},
+            {"classification": None},
+        ]
+
+        result = ClassificationAggregationResult.aggregate(entities)
+
+        assert result.highest_classification is ClassificationLevel.TOP_SECRET
+        assert result.all_classifications == [ClassificationLevel.SECRET, ClassificationLevel.TOP_SECRET]
+        assert result.all_compartments == [Compartment.HUMINT, Compartment.NOFORN]
+
+        with pytest.raises(ValueError):
+            ClassificationAggregationResult.aggregate([{"classification": "bogus"}])
+
     def test_aggregate_with_signature(self):
         entities = [{"classification": ClassificationLevel.SECRET, "portion_markings": ["//NOFORN"]}]
         signing_key = "test-signing-key-12345"
@@ -42,12 +102,35 @@ class TestClassificationAggregation:
         assert result.signature is not None
         assert len(result.signature) == 64
 
+    def test_signature_matches_reference_hmac(self):
+        entities = [{"classification": ClassificationLevel.SECRET, "portion_markings": ["//NOFORN"], "compartments": [Compartment.NOFORN]}]
+        signing_key = "test-signing-key-12345"
+        message = b'{"all_compartments":["NOFORN"],"all_portion_markings":["//NOFORN"],"count":1,"highest_classification":"S"}'
+        expected = hmac.new(signing_key.encode(), message, hashlib.sha256).hexdigest()
+
+        first = ClassificationAggregationResult.aggregate(entities, signing_key=signing_key)
+        second = ClassificationAggregationResult.aggregate(entities, signing_key=signing_key)
 
-class TestAccessControlEngine:
-    @pytest.fixture
-    def engine(self):
-        return AccessControlEngine(ClassificationPolicy(policy_name="Test Policy"))
+        assert first.signature == second.signature == expected
+        assert ClassificationAggregationResult.aggregate(entities, signing_key="other-key").signature != expected
+
+    def test_repeated_aggregate_returns_independent_results(self):
+        entities = [
+            {"classification": ClassificationLevel.SECRET, "portion_markings": ["//NOFORN"]},
+            {"classification": "TS", "compartments": ["HUMINT"]},
+        ]
 
+        first = ClassificationAggregationResult.aggregate(entities, signing_key="k")
+        first.all_portion_markings.append("//MUTATED")
+        second = ClassificationAggregationResult.aggregate(entities, signing_key="k")
+
+        assert second.all_portion_markings == ["//NOFORN"]
+        assert second.all_classifications == [ClassificationLevel.SECRET, ClassificationLevel.TOP_SECRET]
+        assert second.signature == second.compute_signature("k")
+        assert ClassificationAggregationResult.aggregate(entities).signature is None
+
+
+class TestAccessControlEngine:
     def test_deny_insufficient_clearance(self, engine):
         decision = engine.make_access_decision(
             user_id=uuid4(),
@@ -80,6 +163,22 @@ class TestAccessControlEngine:
         assert not decision.allowed
         assert "Missing compartments" in decision.reason
 
+    def test_deny_missing_compartments_lists_missing_sorted(self, engine):
+        decision = engine.make_access_decision(
+            user_id=uuid4(),
+            user_clearance=ClassificationLevel.SECRET,
+            user_compartments=[Compartment.NOFORN],
+            user_roles=["analyst"],
+            user_mfa_verified=True,
+            user_account_suspended=False,
+            resource_classification=ClassificationLevel.SECRET,
+            resource_compartments=[Compartment.SIGINT, Compartment.NOFORN, Compartment.HUMINT],
+            device_posture="trusted",
+            session_active=True,
+        )
+        assert not decision.allowed
+        assert decision.reason == "Missing compartments: HUMINT, SIGINT"
+
     def test_allow_matching_clearance_and_compartments(self, engine):
         decision = engine.make_access_decision(
             user_id=uuid4(),
@@ -95,6 +194,23 @@ class TestAccessControlEngine:
         )
         assert decision.allowed
         assert decision.reason == "All access control checks passed"
+        assert decision.portion_markings == ["//NOFORN", "//HUMINT"]
+
+    def test_allow_with_frozenset_compartments(self, engine):
+        decision = engine.make_access_decision(
+            user_id=uuid4(),
+            user_clearance=ClassificationLevel.SECRET,
+            user_compartments=frozenset({Compartment.HUMINT, Compartment.NOFORN}),
+            user_roles=["analyst"],
+            user_mfa_verified=True,
+            user_account_suspended=False,
+            resource_classification=ClassificationLevel.SECRET,
+            resource_compartments=[Compartment.NOFORN, Compartment.HUMINT],
+            device_posture="trusted",
+            session_active=True,
+        )
+        assert decision.allowed
+        assert decision.user_compartments == [Compartment.NOFORN, Compartment.HUMINT]
 
     def test_deny_suspended_account(self, engine):
         decision = engine.make_access_decision(
@@ -160,42 +276,74 @@ class TestAccessControlEngine:
         assert decision.allowed
         assert any(o.obligation_type == ObligationType.REQUIRE_MFA_STEP_UP for o in decision.obligations)
 
-
-class TestRedactionRules:
-    @pytest.fixture
-    def policy_with_redaction(self):
-        policy = ClassificationPolicy(policy_name="Redaction Policy")
-
-        policy.field_redaction_rules.append(
-            FieldRedactionRule(
-                field_path="user.email",
-                field_type="email",
-                strategy=RedactionStrategy.MASK_WITH_BRACKETS,
-                required_clearance=ClassificationLevel.SECRET,
-            )
+    def test_batch_matches_single_decisions(self, engine):
+        base = dict(
+            user_id=uuid4(),
+            user_clearance=ClassificationLevel.SECRET,
+            user_compartments=[Compartment.NOFORN],
+            user_roles=["analyst"],
+            user_mfa_verified=False,
+            user_account_suspended=False,
+            resource_classification=ClassificationLevel.SECRET,
+            resource_compartments=[Compartment.NOFORN],
+            device_posture="untrusted",
+            session_active=True,
         )
+        requests = [
+            base,
+            dict(base),
+            {**base, "resource_classification": ClassificationLevel.TOP_SECRET},
+            {**base, "resource_compartments": [Compartment.HUMINT]},
+            {**base, "user_account_suspended": True},
+        ]
 
-        policy.field_redaction_rules.append(
-            FieldRedactionRule(
-                field_path="incident.affected_users[*].email",
-                field_type="email",
-                strategy=RedactionStrategy.MASK_WITH_BRACKETS,
-                required_clearance=ClassificationLevel.SECRET,
-                required_compartments=[Compartment.HUMINT],
+        batch = engine.make_access_decisions_batch(requests)
+        single = [engine.make_access_decision(**r) for r in requests]
+
+        exclude = {"decision_id", "decided_at"}
+        assert [d.model_dump(exclude=exclude) for d in batch] == [d.model_dump(exclude=exclude) for d in single]
+        assert batch[0].obligations[0] is batch[1].obligations[0]
+        assert batch[0].obligations is not batch[1].obligations
+
+    def test_specialized_decision_matches_generic(self, engine):
+        decide = engine.specialize(ClassificationLevel.SECRET, [Compartment.NOFORN])
+        assert engine.specialize(ClassificationLevel.SECRET, [Compartment.NOFORN]) is decide
+
+        exclude = {"decision_id", "decided_at"}
+        for clearance, compartments, mfa in [
+            (ClassificationLevel.SECRET, [Compartment.NOFORN], True),
+            (ClassificationLevel.SECRET, [Compartment.NOFORN], False),
+            (ClassificationLevel.CUI, [Compartment.NOFORN], True),
+            (ClassificationLevel.TOP_SECRET, [], True),
+        ]:
+            user = dict(
+                user_id=uuid4(),
+                user_clearance=clearance,
+                user_compartments=compartments,
+                user_roles=["analyst"],
+                user_mfa_verified=mfa,
+                user_account_suspended=False,
+                device_posture="trusted",
+                session_active=True,
             )
-        )
-
-        policy.portion_redaction_rules.append(
-            PortionRedactionRule(
-                portion_name="classified_section",
-                portion_marking="//TS//SCI",
-                minimum_clearance=ClassificationLevel.TS_SCI,
-                strategy=RedactionStrategy.REMOVE_FIELD,
+            generic = engine.make_access_decision(
+                **user,
+                resource_classification=ClassificationLevel.SECRET,
+                resource_compartments=[Compartment.NOFORN],
             )
-        )
+            assert decide(**user).model_dump(exclude=exclude) == generic.model_dump(exclude=exclude)
+
+        user.update(user_clearance=ClassificationLevel.SECRET, user_compartments=[Compartment.NOFORN])
+        first = decide(**user)
+        assert first.allowed
+        first.resource_compartments.append(Compartment.HUMINT)
+        first.portion_markings.append("//MUTATED")
+        second = decide(**user)
+        assert second.resource_compartments == [Compartment.NOFORN]
+        assert second.portion_markings == ["//NOFORN"]
 
-        return policy
 
+class TestRedactionRules:
     def test_field_redaction_applied_simple(self, policy_with_redaction):
         engine = AccessControlEngine(policy_with_redaction)
         data = {"user": {"name": "Alice Smith", "email": "alice@agency.gov"}}
@@ -241,6 +389,174 @@ class TestRedactionRules:
 
         assert redacted["incident"]["affected_users"][0]["email"] == "alice@agency.gov"
 
+    def test_field_redaction_nested_wildcards(self):
+        policy = ClassificationPolicy(policy_name="Nested Policy")
+        policy.field_redaction_rules.append(
+            FieldRedactionRule(
+                field_path="incidents[*].affected_users[*].email",
+                field_type="email",
+                required_clearance=ClassificationLevel.SECRET,
+            )
+        )
+        engine = AccessControlEngine(policy)
+        data = {
+            "incidents": [
+                {"affected_users": [{"email": "a@agency.gov"}, {"name": "no email"}]},
+                {"affected_users": "not a list"},
+                {"other": []},
+            ]
+        }
+
+        redacted = engine.apply_redaction(data, user_clearance=ClassificationLevel.CUI, user_compartments=[])
+
+        assert redacted["incidents"][0]["affected_users"] == [{"email": "[REDACTED]"}, {"name": "no email"}]
+        assert redacted["incidents"][1] == {"affected_users": "not a list"}
+        assert redacted["incidents"][2] == {"other": []}
+
+    def test_fused_redaction_matches_per_rule_redaction(self):
+        policy = ClassificationPolicy(policy_name="Overlapping Policy")
+        for path, clearance, strategy in [
+            ("incident.affected_users[*].email", ClassificationLevel.SECRET, RedactionStrategy.MASK_WITH_BRACKETS),
+            ("incident.affected_users[*].name", ClassificationLevel.TOP_SECRET, RedactionStrategy.MASK_WITH_HASH),
+            ("incident.owner", ClassificationLevel.SECRET, RedactionStrategy.MASK_WITH_BRACKETS),
+            ("incident.owner", ClassificationLevel.SECRET, RedactionStrategy.MASK_WITH_ASTERISKS),
+            ("incident.owner.email", ClassificationLevel.TS_SCI, RedactionStrategy.MASK_WITH_HASH),
+        ]:
+            policy.field_redaction_rules.append(
+                FieldRedactionRule(field_path=path, field_type="pii", strategy=strategy, required_clearance=clearance)
+            )
+        engine = AccessControlEngine(policy)
+        redaction = engine.redaction_engine
+
+        def payload():
+            return {
+                "incident": {
+                    "owner": {"email": "o@agency.gov"},
+                    "affected_users": [{"name": "Alice", "email": "a@agency.gov"}, {"name": "Bob"}],
+                }
+            }
+
+        for clearance in ClassificationLevel:
+            expected = payload()
+            for o in redaction.compute_obligations(clearance, []):
+                redaction.redact_field(expected, o.resource_field, clearance, [])
+
+            assert engine.apply_redaction(payload(), user_clearance=clearance, user_compartments=[]) == expected
+
+    def test_redacted_copy_leaves_payload_untouched(self, policy_with_redaction):
+        engine = AccessControlEngine(policy_with_redaction)
+
+        def payload():
+            return {
+                "title": "Phishing",
+                "user": {"name": "Alice Smith", "email": "alice@agency.gov"},
+                "incident": {"affected_users": [{"name": "Alice", "email": "alice@agency.gov"}, {"name": "Bob"}]},
+                "related_alerts": [{"id": "a-1"}],
+            }
+
+        data = payload()
+        for clearance in ClassificationLevel:
+            for compartments in ([], [Compartment.HUMINT]):
+                copied = engine.redacted_copy(data, user_clearance=clearance, user_compartments=compartments)
+
+                assert copied == engine.apply_redaction(payload(), user_clearance=clearance, user_compartments=compartments)
+                assert data == payload()
+                # Copy-on-write: untouched parts are shared, not copied.
+                assert copied["related_alerts"] is data["related_alerts"]
+                assert copied["incident"]["affected_users"][1] is data["incident"]["affected_users"][1]
+
+        assert engine.redacted_copy(data, user_clearance=ClassificationLevel.TS_SCI, user_compartments=[Compartment.HUMINT]) is data
+
+        # Overlapping rules: a field masked whole must not be rebuilt by a rule below it.
+        overlapping = ClassificationPolicy(policy_name="Overlapping Policy")
+        for path, clearance, compartments in [
+            ("incident.affected_users", ClassificationLevel.TOP_SECRET, []),
+            ("incident.affected_users[*].email", ClassificationLevel.SECRET, [Compartment.HUMINT]),
+            ("incident.owner", ClassificationLevel.TOP_SECRET, []),
+            ("incident.owner.email", ClassificationLevel.SECRET, []),
+        ]:
+            overlapping.field_redaction_rules.append(
+                FieldRedactionRule(
+                    field_path=path, field_type="pii", required_clearance=clearance, required_compartments=compartments
+                )
+            )
+        engine = AccessControlEngine(overlapping)
+
+        def incident():
+            return {
+                "incident": {
+                    "owner": {"name": "Carol", "email": "carol@agency.gov"},
+                    "affected_users": [{"name": "Alice", "email": "alice@agency.gov"}, {"name": "Bob"}],
+                }
+            }
+
+        data = incident()
+        copied = engine.redacted_copy(data, user_clearance=ClassificationLevel.SECRET, user_compartments=[])
+        assert copied == {"incident": {"owner": "[REDACTED]", "affected_users": "[REDACTED]"}}
+        for clearance in ClassificationLevel:
+            for compartments in ([], [Compartment.HUMINT]):
+                copied = engine.redacted_copy(data, user_clearance=clearance, user_compartments=compartments)
+                assert copied == engine.apply_redaction(incident(), user_clearance=clearance, user_compartments=compartments)
+                assert data == incident()
+
+    def test_obligations_cached_until_invalidated(self, policy_with_redaction):
+        policy = policy_with_redaction.model_copy(deep=True)
+        redaction = AccessControlEngine(policy).redaction_engine
+
+        first = redaction.compute_obligations(ClassificationLevel.CUI, [])
+        second = redaction.compute_obligations(ClassificationLevel.CUI, [])
+        assert first == second
+        assert all(a is b for a, b in zip(first, second))
+
+        policy.field_redaction_rules.clear()
+        assert redaction.compute_obligations(ClassificationLevel.CUI, []) == first
+
+        redaction.invalidate_cache()
+        remaining = redaction.compute_obligations(ClassificationLevel.CUI, [])
+        assert [o.obligation_type for o in remaining] == [ObligationType.REDACT_PORTION]
+
+    def test_engine_redaction_changes_after_policy_mutation_and_invalidation(self, policy_with_redaction):
+        policy = policy_with_redaction.model_copy(deep=True)
+        engine = AccessControlEngine(policy)
+        payload = {"user": {"email": "alice@agency.gov"}}
+        kwargs = dict(user_clearance=ClassificationLevel.CUI, user_compartments=[])
+        assert engine.redacted_copy(payload, **kwargs)["user"]["email"] == "[REDACTED]"
+
+        # Plans are memoized: an in-place mutation is not seen until invalidation.
+        policy.field_redaction_rules.clear()
+        assert engine.redacted_copy(payload, **kwargs)["user"]["email"] == "[REDACTED]"
+
+        engine.invalidate_cache()
+        assert engine.redacted_copy(payload, **kwargs) is payload
+        assert engine.apply_redaction({"user": {"email": "alice@agency.gov"}}, **kwargs) == payload
+
+    def test_redaction_follows_rule_path_after_invalidation(self, policy_with_redaction):
+        policy = policy_with_redaction.model_copy(deep=True)
+        engine = AccessControlEngine(policy)
+        policy.field_redaction_rules[0].field_path = "user.phone"
+        engine.invalidate_cache()
+
+        redacted = engine.apply_redaction(
+            {"user": {"email": "alice@agency.gov", "phone": "555-0100"}},
+            user_clearance=ClassificationLevel.CUI,
+            user_compartments=[],
+        )
+
+        assert redacted["user"] == {"email": "alice@agency.gov", "phone": "[REDACTED]"}
+
+    def test_compiled_policy_matches_rule_evaluation(self, policy_with_redaction):
+        redaction = AccessControlEngine(policy_with_redaction).redaction_engine
+
+        for clearance in ClassificationLevel:
+            for compartments in ([], [Compartment.NOFORN], [Compartment.NOFORN, Compartment.HUMINT]):
+                expected = [
+                    r.field_path for r in policy_with_redaction.field_redaction_rules if r.should_redact(clearance, compartments)
+                ] + [
+                    r.portion_name for r in policy_with_redaction.portion_redaction_rules if r.should_redact(clearance, compartments)
+                ]
+                actual = [o.resource_field for o in redaction.compute_obligations(clearance, compartments)]
+                assert actual == expected
+
 
 class TestEndToEndFlow:
     def test_incident_access_with_aggregation_and_banner_values(self):
@@ -1,16 +1,56 @@
+from importlib.util import find_spec
+
 import pytest
-from fastapi.testclient import TestClient
 
-from apps.aegis_demo_api.main import app
+_PACKED_FIELDS = {
+    "X-User-Clearance": "cl",
+    "X-User-Compartments": "cmp",
+    "X-User-Roles": "roles",
+    "X-User-MFA-Verified": "mfa",
+    "X-User-Suspended": "susp",
+    "X-Device-Posture": "dev",
+    "X-Session-Active": "sess",
+}
+
+
+def aegis_ctx(packed=False, **headers):
+    """Auth headers as sent by the tests, or packed into a single X-Aegis-Context header."""
+    if not packed:
+        return headers
+    return {"X-Aegis-Context": ";".join(f"{_PACKED_FIELDS[name]}={value}" for name, value in headers.items())}
+
+
+# Requests run straight through the ASGI app on the test's own event loop (no
+# TestClient portal thread). ASGITransport does not run lifespan events; the
+# demo app has none.
+# The web stack (fastapi, starlette, httpx) is imported by the client fixture,
+# not at collection; find_spec() checks for it without importing it.
+pytestmark = [
+    pytest.mark.anyio,
+    pytest.mark.skipif(find_spec("fastapi") is None or find_spec("httpx") is None, reason="demo API needs fastapi and httpx"),
+]
+
+
+@pytest.fixture(scope="module")
+def anyio_backend():
+    return "asyncio"
 
-client = TestClient(app)
 
+@pytest.fixture(scope="module")
+async def client(anyio_backend):
+    from httpx import ASGITransport, AsyncClient
 
-def test_demo_incident_headers_and_redaction():
+    from apps.aegis_demo_api.main import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+async def test_demo_incident_headers_and_redaction(client):
     incident_id = "00000000-0000-0000-0000-000000000001"
 
     # User lacks HUMINT -> emails redacted
-    r = client.get(
+    r = await client.get(
         f"/demo/incidents/{incident_id}",
         headers={
             "X-User-Clearance": "S",
@@ -36,11 +76,11 @@ def test_demo_incident_headers_and_redaction():
     assert users[1]["email"] == "[REDACTED]"
 
 
-def test_demo_incident_denied_missing_compartment():
+async def test_demo_incident_denied_missing_compartment(client):
     incident_id = "00000000-0000-0000-0000-000000000002"
 
     # Resource requires NOFORN (hardcoded); user has none -> deny
-    r = client.get(
+    r = await client.get(
         f"/demo/incidents/{incident_id}",
         headers={
             "X-User-Clearance": "S",
@@ -50,11 +90,11 @@ def test_demo_incident_denied_missing_compartment():
     assert r.status_code == 403
 
 
-def test_demo_incident_no_redaction_with_humint():
+async def test_demo_incident_no_redaction_with_humint(client):
     """When user has HUMINT compartment, emails should NOT be redacted."""
     incident_id = "00000000-0000-0000-0000-000000000003"
 
-    r = client.get(
+    r = await client.get(
         f"/demo/incidents/{incident_id}",
         headers={
             "X-User-Clearance": "S",
@@ -76,17 +116,26 @@ def test_demo_incident_no_redaction_with_humint():
     assert users[1]["email"] == "bob@agency.gov"
 
 
-def test_health_endpoint():
-    r = client.get("/health")
+async def test_health_endpoint(client):
+    r = await client.get("/health")
     assert r.status_code == 200
-    assert r.json() == {"ok": True}
+    # Exact bytes: stricter than comparing parsed JSON, and no decode.
+    assert r.content == b'{"ok":true}'
+    assert r.headers["content-type"] == "application/json"
+
 
+async def test_health_endpoint_ignores_auth_headers(client):
+    """Only routes that depend on the auth context parse the auth headers."""
+    for path in ("/health", "/openapi.json"):
+        r = await client.get(path, headers={"X-Session-Active": "maybe", "X-User-Clearance": "SECRET"})
+        assert r.status_code == 200
 
-def test_demo_incident_denied_insufficient_clearance():
+
+async def test_demo_incident_denied_insufficient_clearance(client):
     """User with CUI clearance trying to access SECRET resource should be denied."""
     incident_id = "00000000-0000-0000-0000-000000000004"
 
-    r = client.get(
+    r = await client.get(
         f"/demo/incidents/{incident_id}",
         headers={
             "X-User-Clearance": "CUI",
@@ -103,11 +152,11 @@ def test_demo_incident_denied_insufficient_clearance():
     assert "Insufficient clearance" in r.json()["error"]
 
 
-def test_demo_incident_denied_suspended_account():
+async def test_demo_incident_denied_suspended_account(client):
     """Suspended user should be denied access."""
     incident_id = "00000000-0000-0000-0000-000000000005"
 
-    r = client.get(
+    r = await client.get(
         f"/demo/incidents/{incident_id}",
         headers={
             "X-User-Clearance": "S",
@@ -124,11 +173,11 @@ def test_demo_incident_denied_suspended_account():
     assert "suspended" in r.json()["error"].lower()
 
 
-def test_demo_incident_denied_inactive_session():
+async def test_demo_incident_denied_inactive_session(client):
     """Inactive session should be denied."""
     incident_id = "00000000-0000-0000-0000-000000000006"
 
-    r = client.get(
+    r = await client.get(
         f"/demo/incidents/{incident_id}",
         headers={
             "X-User-Clearance": "S",
@@ -143,3 +192,120 @@ def test_demo_incident_denied_inactive_session():
 
     assert r.status_code == 403
     assert "not active" in r.json()["error"].lower()
+
+
+async def test_demo_incident_rejects_malformed_auth_header(client):
+    """Auth headers are parsed before the handler runs; a malformed value is rejected before any decision."""
+    incident_id = "00000000-0000-0000-0000-000000000007"
+
+    r = await client.get(
+        f"/demo/incidents/{incident_id}",
+        headers={
+            "X-User-Clearance": "S",
+            "X-User-Compartments": "NOFORN",
+            "X-Session-Active": "maybe",
+        },
+    )
+
+    assert r.status_code == 422
+    assert "X-Session-Active" in r.json()["detail"]
+
+
+async def test_demo_incident_rejects_unknown_clearance(client):
+    incident_id = "00000000-0000-0000-0000-000000000008"
+
+    r = await client.get(
+        f"/demo/incidents/{incident_id}",
+        headers={"X-User-Clearance": "SECRET", "X-User-Compartments": "NOFORN"},
+    )
+
+    assert r.status_code == 422
+    assert "X-User-Clearance" in r.json()["detail"]
+
+
+async def test_demo_incident_repeated_auth_header_uses_first_value(client):
+    """Like Starlette's headers.get: of a repeated header, the first value counts."""
+    incident_id = "00000000-0000-0000-0000-000000000012"
+
+    r = await client.get(
+        f"/demo/incidents/{incident_id}",
+        headers=[("X-User-Clearance", "CUI"), ("X-User-Clearance", "TS"), ("X-User-Compartments", "NOFORN")],
+    )
+    assert r.status_code == 403
+    assert "insufficient clearance" in r.json()["error"].lower()
+
+    r = await client.get(
+        f"/demo/incidents/{incident_id}",
+        headers=[("X-Aegis-Context", "cl=TS;cmp=NOFORN"), ("X-Aegis-Context", "cl=CUI;cmp=NOFORN")],
+    )
+    assert r.status_code == 200
+
+
+async def test_demo_incident_rendering_is_per_audience(client):
+    """Rendered incidents are reused, but never across users who may see different fields."""
+    incident_id = "00000000-0000-0000-0000-000000000009"
+    humint = {"X-User-Clearance": "S", "X-User-Compartments": "NOFORN,HUMINT"}
+    noforn = {"X-User-Clearance": "S", "X-User-Compartments": "NOFORN"}
+
+    first = await client.get(f"/demo/incidents/{incident_id}", headers=humint)
+    redacted = await client.get(f"/demo/incidents/{incident_id}", headers=noforn)
+    again = await client.get(f"/demo/incidents/{incident_id}", headers=humint)
+
+    assert first.status_code == redacted.status_code == again.status_code == 200
+    assert first.content == again.content
+    assert first.headers["X-Classification-Signature"] == again.headers["X-Classification-Signature"]
+    assert first.json()["incident"]["affected_users"][0]["email"] == "alice@agency.gov"
+    assert redacted.json()["incident"]["affected_users"][0]["email"] == "[REDACTED]"
+
+
+async def test_demo_incident_rejects_malformed_id(client):
+    r = await client.get("/demo/incidents/not-a-uuid", headers={"X-User-Compartments": "NOFORN"})
+    assert r.status_code == 422
+
+    upper = await client.get("/demo/incidents/0000000A-0000-0000-0000-00000000000A", headers={"X-User-Compartments": "NOFORN"})
+    assert upper.status_code == 200
+    assert upper.json()["id"] == "0000000a-0000-0000-0000-00000000000a"
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"X-User-Clearance": "S", "X-User-Compartments": "NOFORN", "X-Device-Posture": "untrusted"},
+        {"X-User-Clearance": "TS", "X-User-Compartments": "NOFORN,HUMINT", "X-User-MFA-Verified": "false"},
+        {"X-User-Clearance": "S", "X-User-Compartments": "NOFORN", "X-User-Suspended": "true"},
+        {"X-User-Clearance": "CUI", "X-User-Compartments": "NOFORN"},
+    ],
+)
+async def test_demo_incident_packed_context_matches_headers(client, headers):
+    incident_id = "00000000-0000-0000-0000-000000000010"
+
+    legacy = await client.get(f"/demo/incidents/{incident_id}", headers=aegis_ctx(**headers))
+    packed = await client.get(f"/demo/incidents/{incident_id}", headers=aegis_ctx(packed=True, **headers))
+
+    assert packed.status_code == legacy.status_code
+    assert packed.content == legacy.content
+    assert packed.headers.get("X-Classification") == legacy.headers.get("X-Classification")
+
+
+async def test_demo_incident_rejects_unknown_packed_field(client):
+    r = await client.get(
+        "/demo/incidents/00000000-0000-0000-0000-000000000010",
+        headers={"X-Aegis-Context": "cl=S;cmp=NOFORN;admin=1"},
+    )
+    assert r.status_code == 422
+
+
+async def test_demo_incident_denials_follow_engine_check_order(client):
+    """Account, then session, then clearance, then compartments — as the engine orders them."""
+    incident_id = "00000000-0000-0000-0000-000000000011"
+    cases = [
+        ({"X-User-Clearance": "CUI", "X-User-Suspended": "true", "X-Session-Active": "false"}, "suspended"),
+        ({"X-User-Clearance": "CUI", "X-Session-Active": "false"}, "not active"),
+        ({"X-User-Clearance": "CUI", "X-User-Compartments": ""}, "insufficient clearance"),
+        ({"X-User-Clearance": "TS", "X-User-Compartments": "HUMINT"}, "missing compartments"),
+    ]
+
+    for headers, reason in cases:
+        r = await client.get(f"/demo/incidents/{incident_id}", headers=headers)
+        assert r.status_code == 403
+        assert reason in r.json()["error"].lower()
@@ -0,0 +1,133 @@
+"""Integration tests: deterministic hashing used for audit/event chaining.
+
+Digests are pinned: a change in canonical encoding breaks existing hash chains.
+"""
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+import pytest
+from pydantic import ValidationError
+
+from aegis_common_schema.base import AegisModel, Compartment, EventEnvelope, compute_hash_chain
+from aegis_common_schema.supply_chain import SBOM, Component, ComponentType, Digest, VRSInputs
+
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def envelope():
+    return EventEnvelope(
+        event_id=UUID(int=1),
+        event_type="x",
+        occurred_at=EPOCH,
+        producer="p",
+        actor={"b": 1, "a": "é"},
+        payload={"z": 1e16, "y": [1, 2]},
+    )
+
+
+@pytest.fixture
+def model():
+    return AegisModel(id=UUID(int=2), created_at=EPOCH, updated_at=EPOCH)
+
+
+class TestDeterministicHashing:
+    def test_envelope_hash_is_stable(self, envelope):
+        assert envelope.compute_hash() == "sha256:d60065beb50fddf7d530ecb8db1ab620eae3055fd3b2576740ff891fa1516c51"
+
+    def test_model_hash_is_stable(self, model):
+        assert model.compute_hash() == "sha256:b5d763bbc7badd1957f6adbe19f87b63b4b1aa3c1f25f296849812828d92688f"
+
+    def test_fingerprint_ignores_timestamps(self, model):
+        expected = "sha256:d747428703b0ef0956066053c7a3b26215a79ae605bed9d829124e626b7aec3b"
+        assert model.stable_fingerprint() == expected
+        model.update_timestamp()
+        assert model.stable_fingerprint() == expected
+
+    def test_digests_match_individual_methods(self, model):
+        model.compartments.append(Compartment.NOFORN)
+        assert model.compute_digests() == (model.compute_hash(), model.stable_fingerprint())
+
+    def test_hash_chain_links_envelopes(self, envelope):
+        envelopes = [envelope, envelope.model_copy(update={"event_id": UUID(int=3)})]
+
+        hashes = compute_hash_chain(envelopes, prev="sha256:genesis")
+
+        assert envelopes[0].hash_chain_prev == "sha256:genesis"
+        assert envelopes[1].hash_chain_prev == hashes[0]
+        assert hashes == [e.compute_hash() for e in envelopes]
+
+    def test_vrs_inputs_hash_is_stable(self):
+        inputs = VRSInputs(critical_cve_count=2, kev_present=True, reputation_score=7.5)
+        assert inputs.inputs_hash == "sha256:0acc099ce183835ec83c1cfb52dbce3f1d1ffa25c2f089c11e2aff28a3dbb52d"
+
+    def test_component_fingerprint_ignores_vulnerability_order(self):
+        vulns = [UUID(int=n) for n in (3, 1, 2)]
+        components = [
+            Component(
+                id=UUID(int=4),
+                component_type=ComponentType.LIBRARY,
+                component_id="pkg:pypi/demo",
+                name="demo",
+                version="1.0",
+                known_vulnerabilities=order,
+            )
+            for order in (vulns, vulns[::-1] + vulns)
+        ]
+
+        assert components[0].model_dump(mode="json")["known_vulnerabilities"] == [str(UUID(int=n)) for n in (1, 2, 3)]
+        assert components[0].stable_fingerprint() == components[1].stable_fingerprint()
+
+    def test_sbom_digest_is_stable_and_ignores_timestamps(self):
+        sbom = SBOM(
+            id=UUID(int=5),
+            sbom_name="demo",
+            subject_name="svc",
+            subject_type=ComponentType.APPLICATION,
+            created_at_sbom=EPOCH,
+            components=[
+                Component(id=UUID(int=n), component_type=ComponentType.LIBRARY, component_id=f"c{n}", name=f"n{n}", version="1")
+                for n in (1, 2)
+            ],
+        )
+        expected = "sha256:90357fefb995235f78935035cab06e6113e2d4208dd89d6f4bd0a828f427d6ce"
+        assert str(sbom.compute_digest()) == expected
+
+        sbom.sbom_digest = sbom.compute_digest()
+        sbom.update_timestamp()
+        sbom.components[0].update_timestamp()
+        assert str(sbom.compute_digest()) == expected
+
+    def test_frozen_component_is_hashable_by_fingerprint(self):
+        fields = dict(
+            id=UUID(int=4), created_at=EPOCH, updated_at=EPOCH, component_type=ComponentType.LIBRARY, component_id="c", name="n", version="1"
+        )
+        component, same = Component(**fields), Component(**fields)
+
+        assert hash(component) == hash(same)
+        assert {component: "cached"}[same] == "cached"
+        with pytest.raises(ValidationError):
+            component.name = "other"
+        component.update_timestamp()
+        assert hash(component) == hash(same)
+
+    def test_component_digest_index_follows_copies(self):
+        component = Component(
+            component_type=ComponentType.LIBRARY,
+            component_id="c",
+            name="n",
+            version="1",
+            hashes=[{"alg": "sha256", "value": "ab"}, {"alg": "sha1", "value": "cd"}],
+        )
+        assert component.has_digest(Digest(alg="sha1", value="cd"))
+        assert not component.has_digest(Digest(alg="md5", value="cd"))
+        assert component.model_dump(mode="json")["hashes"][0] == {"alg": "sha256", "value": "ab"}
+
+        updated = component.model_copy(update={"hashes": (Digest(alg="md5", value="cd"),)})
+        assert updated.has_digest(Digest(alg="md5", value="cd"))
+        assert hash(updated) != hash(component)
+
+        digest = Digest(alg="md5", value="cd")
+        assert str(digest) == "md5:cd"
+        assert str(digest.model_copy(update={"value": "ef"})) == "md5:ef"
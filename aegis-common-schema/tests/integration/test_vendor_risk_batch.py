@@ -0,0 +1,40 @@
+"""Integration tests: vectorized vendor risk scoring agrees with calculate_scores()."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aegis_common_schema.supply_chain import VendorRiskScore, VRSInputs
+
+INPUTS = [
+    VRSInputs(),
+    VRSInputs(critical_cve_count=3, high_cve_count=1, kev_present=True, asset_criticality=10),
+    VRSInputs(medium_cve_count=7, incident_count_12mo=2, breach_count=1, reputation_score=8.5, days_since_sbom_update=45, asset_criticality=2),
+    VRSInputs(high_cve_count=2, reputation_score=4.0, days_since_sbom_update=400, asset_criticality=5),
+    VRSInputs(critical_cve_count=1, kev_present=True, breach_count=4, reputation_score=10.0, asset_criticality=9),
+]
+
+FIELDS = [
+    "critical_cve_count",
+    "high_cve_count",
+    "medium_cve_count",
+    "kev_present",
+    "incident_count_12mo",
+    "breach_count",
+    "reputation_score",
+    "days_since_sbom_update",
+    "asset_criticality",
+]
+
+
+class TestVendorRiskBatch:
+    def test_batch_matches_scalar_scores(self):
+        columns = [np.array([getattr(i, f) for i in INPUTS]) for f in FIELDS]
+
+        *scores, tiers = VendorRiskScore.calculate_scores_batch(*columns)
+
+        for row, inputs in enumerate(INPUTS):
+            *expected, expected_tier = VendorRiskScore.calculate_scores(inputs)
+            assert [round(float(s[row]), 2) for s in scores] == expected
+            assert tiers[row] is expected_tier
+        assert len(set(tiers)) == 4  # every tier threshold is exercised